@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class AutoblogConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'autoblog'
+
+    def ready(self):
+        from .signals import affiliate_signals, blog_signals  # noqa: F401
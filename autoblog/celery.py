@@ -1,6 +1,7 @@
 # autoblog/celery.py
 import os
 from celery import Celery
+from celery.signals import worker_process_init
 
 
 # Set default django settings module
@@ -11,7 +12,24 @@ app = Celery('autoblog')
 
 app.config_from_object('django.conf:settings', namespace='CELERY')
 
+# Every worker imports all of these at boot, including workers that only
+# flush affiliate clicks, so task modules must import nothing beyond
+# models and utils at module level (no admin hooks or views) and must
+# leave the generation model unloaded until a task needs it.
+TASK_MODULES = ('affiliate_tasks', 'generation_tasks', 'export_tasks')
+
 app.autodiscover_tasks()
+for task_module in TASK_MODULES:
+    app.autodiscover_tasks(['autoblog.tasks'], related_name=task_module)
+
+
+@worker_process_init.connect
+def preload_generation_model(**kwargs):
+    from django.conf import settings
+
+    if getattr(settings, 'AUTO_BLOG_PRELOAD_MODEL', False):
+        from .utils.model_registry import registry
+        registry.load()
 
 
 @app.task(bind=True, ignore_result=True)
@@ -0,0 +1,36 @@
+# autoblog/management/commands/archive_affiliate_clicks.py
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ...utils.click_retention import archive_clicks
+
+
+class Command(BaseCommand):
+    help = (
+        "Move affiliate clicks older than the retention window into "
+        "compressed monthly archive files"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int,
+            default=settings.AFFILIATE_CLICK_RETENTION_DAYS,
+            help="Keep clicks from this many most recent days")
+        parser.add_argument(
+            '--archive-dir', default=settings.AFFILIATE_CLICK_ARCHIVE_DIR)
+        parser.add_argument(
+            '--batch-size', type=int,
+            default=settings.AFFILIATE_CLICK_ARCHIVE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options['days'])
+        archived = archive_clicks(
+            before=before,
+            archive_dir=options['archive_dir'],
+            batch_size=options['batch_size'],
+        )
+        self.stdout.write(
+            f"Archived {archived} clicks older than {before:%Y-%m-%d}")
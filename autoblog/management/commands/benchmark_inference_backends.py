@@ -0,0 +1,81 @@
+# autoblog/management/commands/benchmark_inference_backends.py
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ...utils.inference_backends import BACKENDS, load_model
+
+
+class Command(BaseCommand):
+    help = "Measure CPU generation throughput for each inference backend"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--backend', action='append', dest='backends',
+            choices=list(BACKENDS),
+            help="Backend to benchmark; repeat for several (default: all)")
+        parser.add_argument(
+            '--prompt',
+            default="Here is a beginner's guide to affiliate marketing.")
+        parser.add_argument('--new-tokens', type=int, default=128)
+        parser.add_argument('--batch-size', type=int, default=1)
+        parser.add_argument('--num-beams', type=int, default=1)
+        parser.add_argument('--runs', type=int, default=3)
+
+    def handle(self, *args, **options):
+        import torch
+        from transformers import AutoTokenizer
+        from transformers.generation import GenerationConfig
+
+        model_name = settings.AUTO_BLOG_MODEL_NAME
+        backends = options['backends'] or list(BACKENDS)
+
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        if tokenizer.pad_token is None:
+            tokenizer.pad_token = tokenizer.eos_token or "[PAD]"
+        tokenizer.padding_side = "left"
+
+        inputs = tokenizer([options['prompt']] * options['batch_size'],
+                           return_tensors="pt", padding=True)
+        prompt_length = inputs['input_ids'].shape[-1]
+
+        # Force a fixed output length so every backend does the same work.
+        config = GenerationConfig(
+            max_new_tokens=options['new_tokens'],
+            min_new_tokens=options['new_tokens'],
+            do_sample=False,
+            num_beams=options['num_beams'],
+            eos_token_id=tokenizer.eos_token_id,
+            pad_token_id=tokenizer.eos_token_id,
+        )
+
+        self.stdout.write(
+            f"Model: {model_name}, threads: {torch.get_num_threads()}, "
+            f"batch: {options['batch_size']}, beams: {options['num_beams']}, "
+            f"new tokens: {options['new_tokens']}, runs: {options['runs']}"
+        )
+        self.stdout.write(f"{'backend':<14}{'load (s)':>10}{'tokens/sec':>14}")
+
+        for backend in backends:
+            start = time.perf_counter()
+            model = load_model(model_name, backend)
+            load_time = time.perf_counter() - start
+
+            with torch.no_grad():
+                # Warm-up run, not timed.
+                model.generate(**inputs, generation_config=config)
+
+                generated_tokens = 0
+                start = time.perf_counter()
+                for _ in range(options['runs']):
+                    outputs = model.generate(
+                        **inputs, generation_config=config)
+                    generated_tokens += outputs[:, prompt_length:].numel()
+                elapsed = time.perf_counter() - start
+
+            self.stdout.write(
+                f"{backend:<14}{load_time:>10.1f}"
+                f"{generated_tokens / elapsed:>14.1f}"
+            )
+            del model
@@ -0,0 +1,41 @@
+# autoblog/management/commands/export_affiliate_clicks.py
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ...utils.click_export import (
+    EXPORT_FORMATS, iter_clicks, parse_export_time, render_clicks)
+
+
+class Command(BaseCommand):
+    help = "Stream affiliate clicks in a time range as CSV or NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--start', help="ISO date or datetime to export from (inclusive)")
+        parser.add_argument(
+            '--end', help="ISO date or datetime to export up to (exclusive)")
+        parser.add_argument(
+            '--format', choices=sorted(EXPORT_FORMATS), default='csv')
+        parser.add_argument(
+            '--output', help="File to write to instead of stdout")
+        parser.add_argument(
+            '--batch-size', type=int,
+            default=settings.AFFILIATE_CLICK_EXPORT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            start = parse_export_time(options['start'])
+            end = parse_export_time(options['end'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        rows = iter_clicks(
+            start=start, end=end, batch_size=options['batch_size'])
+        chunks = render_clicks(rows, options['format'])
+
+        if options['output']:
+            with open(options['output'], 'w', newline='') as output:
+                output.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
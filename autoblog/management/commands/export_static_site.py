@@ -0,0 +1,33 @@
+# autoblog/management/commands/export_static_site.py
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ...utils.static_export import export_lock, export_static_pages
+
+
+class Command(BaseCommand):
+    help = (
+        "Render live blog posts, blog indexes and home pages to static HTML "
+        "files, re-rendering only pages published since the last export"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', default=settings.STATIC_EXPORT_DIR,
+            help="Directory to write to (defaults to STATIC_EXPORT_DIR)")
+        parser.add_argument(
+            '--force', action='store_true',
+            help="Render every page, ignoring the previous export")
+
+    def handle(self, *args, **options):
+        if not options['output']:
+            raise CommandError(
+                "Set STATIC_EXPORT_DIR or pass --output")
+        with export_lock() as acquired:
+            if not acquired:
+                raise CommandError("Another static export is running")
+            rendered, removed = export_static_pages(
+                options['output'], force=options['force'])
+        self.stdout.write(
+            f"Rendered {rendered} pages and removed {removed} "
+            f"into {options['output']}")
@@ -0,0 +1,28 @@
+# autoblog/management/commands/rebuild_click_rollups.py
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ...utils.click_rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the hourly and daily affiliate click rollups from the "
+        "raw click table"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=7,
+            help="Number of most recent days to rebuild (default: 7)")
+
+    def handle(self, *args, **options):
+        since = rebuild_rollups(
+            timezone.now() - timedelta(days=options['days']))
+        if since is None:
+            self.stdout.write("No raw clicks to rebuild click rollups from")
+        else:
+            self.stdout.write(
+                f"Rebuilt click rollups since {since:%Y-%m-%d}")
@@ -0,0 +1,116 @@
+# autoblog/management/commands/relink_blog_pages.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from wagtail.models import Revision
+from wagtail.signals import page_published
+
+from ...models.blog_models import BlogPage
+from ...signals.blog_signals import blog_pages_updated
+from ...utils.affiliate_linker import (
+    build_affiliate_linker,
+    strip_affiliate_links,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-run the affiliate linker over every BlogPage body and publish "
+        "the pages whose links changed"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500)
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help="Report how many pages would change without saving them")
+        parser.add_argument(
+            '--no-revisions', action='store_true',
+            help="Update the live body only, without publishing a revision")
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        linker = build_affiliate_linker()
+
+        scanned = changed = skipped = 0
+        batch = []
+        pages = BlogPage.objects.order_by('pk')
+        for page in pages.iterator(chunk_size=chunk_size):
+            scanned += 1
+            body = linker.link(
+                strip_affiliate_links(page.body), post_id=page.pk)
+            if body == page.body:
+                continue
+
+            if page.has_unpublished_changes and not options['no_revisions']:
+                # Publishing a revision from the live content would bury
+                # the pending draft, so leave these for an editor.
+                skipped += 1
+                continue
+
+            changed += 1
+            page.body = body
+            batch.append(page)
+            if len(batch) >= chunk_size:
+                self.save_batch(batch, options)
+                batch = []
+
+        if batch:
+            self.save_batch(batch, options)
+
+        self.stdout.write(
+            f"Scanned {scanned} pages: {changed} relinked, "
+            f"{skipped} skipped with unpublished changes"
+            + (" (dry run)" if options['dry_run'] else "")
+        )
+
+    def save_batch(self, pages, options):
+        if options['dry_run']:
+            return
+
+        if options['no_revisions']:
+            with transaction.atomic():
+                BlogPage.objects.bulk_update(pages, ['body'])
+                # No publish signal is sent for a live-only update, so drop
+                # the cached and exported copies of these pages directly.
+                page_ids = [page.pk for page in pages]
+                transaction.on_commit(lambda: blog_pages_updated(page_ids))
+            self.stdout.write(f"Updated {len(pages)} relinked pages")
+            return
+
+        now = timezone.now()
+        with transaction.atomic():
+            revisions = Revision.objects.bulk_create([
+                Revision(
+                    content_type=page.get_content_type(),
+                    base_content_type=page.get_base_content_type(),
+                    object_id=str(page.pk),
+                    object_str=str(page),
+                    content=page.serializable_data(),
+                    created_at=now,
+                )
+                for page in pages
+            ])
+            for page, revision in zip(pages, revisions):
+                page.latest_revision = revision
+                page.live_revision = revision
+                page.latest_revision_created_at = now
+                page.last_published_at = now
+            BlogPage.objects.bulk_update(pages, [
+                'body',
+                'latest_revision',
+                'live_revision',
+                'latest_revision_created_at',
+                'last_published_at',
+            ])
+
+            # Let anything listening for publishes (caches, exports) see
+            # the new content once the batch has committed.
+            transaction.on_commit(lambda: [
+                page_published.send(
+                    sender=BlogPage, instance=page, revision=revision)
+                for page, revision in zip(pages, revisions)
+            ])
+
+        self.stdout.write(f"Published {len(pages)} relinked pages")
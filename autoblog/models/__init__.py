@@ -0,0 +1,6 @@
+from . import (  # noqa: F401
+    affiliate_models,
+    blog_models,
+    generation_models,
+    home_models,
+)
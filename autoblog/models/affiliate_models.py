@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from modelcluster.models import ClusterableModel
@@ -18,25 +20,125 @@ class Affiliate(ClusterableModel):
         return self.name
 
 
+class UserAgent(models.Model):
+    """
+    Deduplicated user-agent strings, so clicks reference a fixed-width id
+    and bot classification is done once per distinct user agent.
+    """
+    hash = models.CharField(max_length=40, unique=True)
+    text = models.TextField(blank=True)
+    is_bot = models.BooleanField(default=False, db_index=True)
+    first_seen = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return self.text[:100]
+
+
 class AffiliateClick(models.Model):
     """
     Tracks clicks on affiliate links within blog posts
     """
     affiliate = models.ForeignKey(Affiliate, on_delete=models.CASCADE)
     click_time = models.DateTimeField(default=timezone.now)
-    ip_address = models.GenericIPAddressField()
-    user_agent = models.TextField(blank=True)
+    ip_address = models.GenericIPAddressField(
+        null=True, blank=True, unpack_ipv4=True)
+    user_agent = models.ForeignKey(
+        UserAgent,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='clicks'
+    )
     affiliate_product = models.CharField(max_length=255)
+    post = models.ForeignKey(
+        'BlogPage',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='affiliate_clicks'
+    )
     revenue = models.DecimalField(
         max_digits=10, decimal_places=2, null=True, blank=True)
 
     class Meta:
         indexes = [
-            models.Index(fields=['-click_time']),
+            # Serves both time-ordered scans and keyset pagination on
+            # (click_time, id) for exports.
+            models.Index(fields=['click_time', 'id']),
             models.Index(fields=['affiliate_product']),
         ]
 
 
+class AffiliateClickRollup(models.Model):
+    """
+    Click and revenue totals per affiliate, product and post for one time
+    bucket, maintained incrementally as clicks are flushed.
+    """
+    affiliate = models.ForeignKey(Affiliate, on_delete=models.CASCADE)
+    affiliate_product = models.CharField(max_length=255)
+    post = models.ForeignKey(
+        'BlogPage',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    clicks = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        abstract = True
+
+
+class AffiliateClickHourly(AffiliateClickRollup):
+    hour = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.affiliate} / {self.affiliate_product} @ {self.hour}"
+
+    class Meta:
+        verbose_name = "Hourly Affiliate Clicks"
+        verbose_name_plural = "Hourly Affiliate Clicks"
+        constraints = [
+            # NULL posts are coalesced to 0 so they count as equal;
+            # SQLite does not support nulls_distinct=False.
+            models.UniqueConstraint(
+                'hour', 'affiliate', 'affiliate_product',
+                Coalesce('post', Value(0)),
+                name='unique_affiliate_click_hour',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['affiliate', '-hour']),
+            models.Index(fields=['post', '-hour']),
+        ]
+
+
+class AffiliateClickDaily(AffiliateClickRollup):
+    day = models.DateField()
+
+    def __str__(self):
+        return f"{self.affiliate} / {self.affiliate_product} @ {self.day}"
+
+    class Meta:
+        verbose_name = "Daily Affiliate Clicks"
+        verbose_name_plural = "Daily Affiliate Clicks"
+        constraints = [
+            # NULL posts are coalesced to 0 so they count as equal;
+            # SQLite does not support nulls_distinct=False.
+            models.UniqueConstraint(
+                'day', 'affiliate', 'affiliate_product',
+                Coalesce('post', Value(0)),
+                name='unique_affiliate_click_day',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['affiliate', '-day']),
+            models.Index(fields=['post', '-day']),
+        ]
+
+
 class Keyword(Orderable):
     affiliate = ParentalKey(
         Affiliate,
@@ -1,5 +1,12 @@
 
+import hashlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
 from django.db import models
+from django.db.models import Q
 
 from modelcluster.fields import ParentalKey
 from modelcluster.contrib.taggit import ClusterTaggableManager
@@ -10,6 +17,9 @@ from wagtail.fields import RichTextField
 from wagtail.admin.panels import MultiFieldPanel
 from wagtail.search import index
 
+from ..utils.blog_cache import blog_listing_cache_key, blog_listings_version
+from ..utils.page_cache import FullPageCacheMixin
+
 
 class BlogPageTag(TaggedItemBase):
     content_object = ParentalKey(
@@ -19,31 +29,147 @@ class BlogPageTag(TaggedItemBase):
     )
 
 
-class BlogTagIndexPage(Page):
+class BlogTagIndexPage(FullPageCacheMixin, Page):
+    cache_query_params = ('tag', 'page')
+
+    @staticmethod
+    def get_tag_post_ids(tag):
+        """
+        Ids of the live posts tagged ``tag``, newest first. The list is
+        computed once and cached until a post is published or unpublished,
+        so tag pages do not join through taggit on every request.
+        """
+        cache_key = blog_listing_cache_key(
+            'tag', hashlib.md5(tag.encode()).hexdigest())
+        post_ids = cache.get(cache_key)
+        if post_ids is None:
+            post_ids = list(
+                BlogPage.objects.live()
+                .filter(tags__name=tag, first_published_at__isnull=False)
+                .order_by('-first_published_at', '-id')
+                .values_list('id', flat=True)
+            )
+            cache.set(
+                cache_key, post_ids,
+                timeout=settings.BLOG_LISTING_CACHE_TIMEOUT)
+        return post_ids
 
     def get_context(self, request):
-        tag = request.GET.get('tag')
-        blogpages = BlogPage.objects.filter(tags__name=tag)
-
         context = super().get_context(request)
-        context['blogpages'] = blogpages
+        tag = request.GET.get('tag', '')
+
+        paginator = Paginator(
+            self.get_tag_post_ids(tag) if tag else [],
+            settings.BLOG_TAG_PAGE_SIZE,
+        )
+        page_obj = paginator.get_page(request.GET.get('page'))
+
+        context['tag'] = tag
+        context['page_obj'] = page_obj
+        # Only evaluated when the cached listing fragment has expired.
+        context['blogpages'] = (
+            BlogPage.objects.filter(id__in=page_obj.object_list)
+            .defer('body', 'affiliate_cta')
+            .order_by('-first_published_at', '-id')
+        )
+        context['listing_version'] = blog_listings_version()
+        context['listing_timeout'] = settings.BLOG_LISTING_CACHE_TIMEOUT
         return context
 
 
-class BlogIndexPage(Page):
+# Cursors store publish times as whole microseconds since the epoch.
+# Integer arithmetic keeps them exact; a float timestamp would round
+# away the microseconds of recent dates.
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def encode_listing_cursor(page):
+    published = (page.first_published_at - EPOCH) // MICROSECOND
+    return f"{published}-{page.pk}"
+
+
+def decode_listing_cursor(cursor):
+    """
+    Return the ``(first_published_at, id)`` encoded in ``cursor``, or
+    ``None`` if it is missing or malformed.
+    """
+    try:
+        published, pk = map(int, cursor.split('-'))
+        published = EPOCH + published * MICROSECOND
+    except (AttributeError, ValueError, OverflowError, OSError):
+        return None
+    return published, pk
+
+
+class BlogIndexPage(FullPageCacheMixin, Page):
     intro = RichTextField(blank=True)
-    # add the get_context method:
+    cache_query_params = ('after',)
+
+    def get_listing(self, request, cursor=None):
+        """
+        One page of post cards, newest first, starting after ``cursor``.
+
+        Posts are paged by seeking past the ``(first_published_at, id)`` of
+        the last card rather than with an offset, so every page costs the
+        same however many posts there are. Pages are cached until the next
+        post is published or unpublished.
+        """
+        position = decode_listing_cursor(cursor)
+        cache_key = blog_listing_cache_key(
+            'index', self.pk,
+            "{}-{}".format(*position) if position else 'first')
+        listing = cache.get(cache_key)
+        if listing is not None:
+            return listing
+
+        page_size = settings.BLOG_INDEX_PAGE_SIZE
+        posts = (
+            BlogPage.objects.child_of(self).live()
+            .filter(first_published_at__isnull=False)
+            .defer('body', 'affiliate_cta')
+            .order_by('-first_published_at', '-id')
+        )
+        if position:
+            published, pk = position
+            posts = posts.filter(
+                Q(first_published_at__lt=published)
+                | Q(first_published_at=published, id__lt=pk)
+            )
+        posts = list(posts[:page_size + 1])
+
+        listing = {
+            'posts': [
+                {
+                    'title': post.title,
+                    'url': post.get_url(request),
+                    'intro': post.intro,
+                    'date': post.date,
+                    'thumbnail': post.thumbnail.url if post.thumbnail else '',
+                }
+                for post in posts[:page_size]
+            ],
+            'next_cursor': (
+                encode_listing_cursor(posts[page_size - 1])
+                if len(posts) > page_size else None
+            ),
+        }
+        cache.set(
+            cache_key, listing, timeout=settings.BLOG_LISTING_CACHE_TIMEOUT)
+        return listing
 
     def get_context(self, request):
         context = super().get_context(request)
-        blogpages = self.get_children().live().order_by('-first_published_at')
-        context['blogpages'] = blogpages
+        listing = self.get_listing(request, request.GET.get('after'))
+        context['blogpages'] = listing['posts']
+        context['next_cursor'] = listing['next_cursor']
+        context['is_first_page'] = 'after' not in request.GET
         return context
 
     content_panels = Page.content_panels + ["intro"]
 
 
-class BlogPage(Page):
+class BlogPage(FullPageCacheMixin, Page):
     date = models.DateField("Post date")
     intro = models.CharField(max_length=250)
     body = RichTextField(blank=True)
@@ -55,7 +181,10 @@ class BlogPage(Page):
     ]
 
     def main_image(self):
-        gallery_item = self.gallery_images.first()
+        gallery_images = getattr(self, 'gallery_images', None)
+        if gallery_images is None:
+            return None
+        gallery_item = gallery_images.first()
         if gallery_item:
             return gallery_item.image
         else:
@@ -33,6 +33,75 @@ class GenerationState(models.Model):
         super().save(*args, **kwargs)
 
 
+class GenerationRun(models.Model):
+    """
+    Durable record of a single post generation, checkpointed after each
+    stage so a retried task resumes where the previous attempt failed.
+    """
+    # Stages are numbered in pipeline order; a run has completed every
+    # stage numbered at or below its own.
+    PLANNED = 0
+    SECTIONS_GENERATED = 1
+    TITLE_GENERATED = 2
+    PAGE_SAVED = 3
+    LINKS_PROCESSED = 4
+    PUBLISHED = 5
+    STAGE_CHOICES = [
+        (PLANNED, "Planned"),
+        (SECTIONS_GENERATED, "Sections generated"),
+        (TITLE_GENERATED, "Title generated"),
+        (PAGE_SAVED, "Page saved"),
+        (LINKS_PROCESSED, "Links processed"),
+        (PUBLISHED, "Revision published"),
+    ]
+
+    task_id = models.CharField(
+        max_length=255, unique=True, null=True, blank=True)
+    affiliate = models.ForeignKey(
+        'Affiliate',
+        on_delete=models.CASCADE,
+        related_name='generation_runs'
+    )
+    keyword = models.ForeignKey(
+        'Keyword',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    seed = models.BigIntegerField()
+    stage = models.PositiveSmallIntegerField(
+        choices=STAGE_CHOICES, default=PLANNED)
+    intro = models.TextField(blank=True)
+    body = models.TextField(blank=True)
+    title = models.CharField(max_length=255, blank=True)
+    post = models.ForeignKey(
+        'BlogPage',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.affiliate} / {self.keyword}: {self.get_stage_display()}"
+
+    class Meta:
+        verbose_name = "Generation Run"
+        verbose_name_plural = "Generation Runs"
+        ordering = ['-created_at']
+
+    def advance(self, stage, **fields):
+        for name, value in fields.items():
+            setattr(self, name, value)
+        self.stage = stage
+        self.last_error = ""
+        self.save()
+
+
 class Prompt(Orderable):
     SECTION_CHOICES = [
         ("T", "Title"),
@@ -1,10 +1,11 @@
-
 from wagtail.models import Page
 from wagtail.fields import StreamField
 from wagtail.admin.panels import FieldPanel
 from wagtail import blocks
 from wagtail.images.blocks import ImageChooserBlock
 
+from ..utils.page_cache import FullPageCacheMixin
+
 
 class HeroBlock(blocks.StructBlock):
     heading = blocks.CharBlock(required=True)
@@ -46,7 +47,7 @@ class ToolPromoBlock(blocks.StructBlock):
         label = "Affiliate Tool Promo"
 
 
-class HomePage(Page):
+class HomePage(FullPageCacheMixin, Page):
     body = StreamField([
         ('hero', HeroBlock()),
         ('featured_posts', FeaturedPostBlock()),
@@ -51,6 +51,7 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
 
     "affiliate",
+    "autoblog",
     "celery",
     "django_celery_beat",
     "django_celery_results"
@@ -99,6 +100,15 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": os.path.join(BASE_DIR, "db.sqlite3"),
+        # SQLite ignores select_for_update(). Starting every transaction
+        # with BEGIN IMMEDIATE takes the write lock up front, so concurrent
+        # claim_next_pairs calls queue (up to "timeout" seconds) instead of
+        # both reading the rotation and one failing with "database is
+        # locked" when it writes.
+        "OPTIONS": {
+            "transaction_mode": "IMMEDIATE",
+            "timeout": 20,
+        },
     }
 }
 
@@ -195,6 +205,27 @@ WAGTAILADMIN_BASE_URL = "http://example.com"
 WAGTAILDOCS_EXTENSIONS = ["csv", "docx", "key",
                           "odt", "pdf", "pptx", "rtf", "txt", "xlsx", "zip"]
 
+# Caches
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# The default cache is shared by all web and worker processes; it is used
+# to tell every process when its in-memory affiliate linker is stale.
+# The generation cache holds generated post sections so a retried
+# generation task resumes instead of decoding them again; it is database
+# backed so it survives worker restarts (run "manage.py createcachetable").
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": "redis://localhost:6379/1",
+    },
+    "generation": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "autoblog_generation_cache",
+        "TIMEOUT": 60 * 60 * 24 * 7,
+    },
+}
+
+AUTO_BLOG_GENERATION_CACHE = "generation"
+
 # Celery
 # Add these to your existing settings
 CELERY_BROKER_URL = "redis://localhost:6379/0"
@@ -202,16 +233,131 @@ CELERY_RESULT_BACKEND = "redis://localhost:6379/0"
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_TIMEZONE = "Europe/London"  # Set to your timezone
+# Prefork children are killed if they have not reported ready within this
+# many seconds (Celery's default is 4). Loading the generation model at
+# process start (AUTO_BLOG_PRELOAD_MODEL), especially with the int8 or
+# ONNX backends, takes far longer than that.
+CELERY_WORKER_PROC_ALIVE_TIMEOUT = 300
 
 
 # Celery Beat Configuration
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
 
+# Entries here are synced into the database scheduler on beat start-up and
+# can then be managed from the Scheduling menu like any other task.
+CELERY_BEAT_SCHEDULE = {
+    "flush-affiliate-clicks": {
+        "task": "autoblog.tasks.affiliate_tasks.flush_affiliate_clicks",
+        "schedule": 30.0,
+    },
+    "archive-affiliate-clicks": {
+        "task": "autoblog.tasks.affiliate_tasks.archive_affiliate_clicks",
+        "schedule": 60 * 60 * 24,
+    },
+}
+
+# Affiliate clicks
+# Clicks are appended to a Redis list by the click view and written to the
+# database in bulk by the flush-affiliate-clicks task.
+AFFILIATE_CLICK_BUFFER_URL = "redis://localhost:6379/2"
+# Seconds to wait when connecting to or talking to the buffer. Clicks are
+# buffered while the visitor waits for the redirect, so a stalled Redis
+# must fail fast rather than hold the request.
+AFFILIATE_CLICK_BUFFER_TIMEOUT = 0.5
+AFFILIATE_CLICK_FLUSH_BATCH_SIZE = 1000
+# Seconds a flush may hold its lock per batch before another flush may
+# take over the claimed (unacknowledged) clicks.
+AFFILIATE_CLICK_FLUSH_LOCK_TIMEOUT = 300
+
+# Redirect targets are cached per process for this many seconds (and in
+# the shared cache until the affiliate changes), so clicks do not query
+# the database.
+AFFILIATE_LINK_LOCAL_TTL = 30
+AFFILIATE_LINK_LOCAL_CACHE_SIZE = 1024
+
+# Number of user-agent ids each process keeps in memory when flushing
+# clicks, so repeat visitors' user agents are not looked up again.
+USER_AGENT_CACHE_SIZE = 10_000
+
+# Additional user-agent substrings (case-insensitive) treated as bots.
+# Clicks from bots and browser prefetches are redirected but not recorded.
+AFFILIATE_EXTRA_BOT_TOKENS = []
+
+# Rows fetched per query when streaming a click export.
+AFFILIATE_CLICK_EXPORT_BATCH_SIZE = 5000
+
+# Raw clicks older than this are moved into one gzipped CSV per month in
+# AFFILIATE_CLICK_ARCHIVE_DIR; the hourly and daily rollups are kept.
+AFFILIATE_CLICK_RETENTION_DAYS = 90
+AFFILIATE_CLICK_ARCHIVE_DIR = os.path.join(BASE_DIR, "click_archive")
+AFFILIATE_CLICK_ARCHIVE_BATCH_SIZE = 5000
+
 
 # Hugging Face model settings (choose appropriate model for your niche)
 # Consider using facebook/bart-large-cnn or another suitable model
 AUTO_BLOG_MODEL_NAME = "openai-community/gpt2"
 
+# Number of posts planned and generated in parallel by each run of the
+# generate_blog_post_batch task.
+AUTO_BLOG_POSTS_PER_BATCH = 10
+
+# Extra keywords, on top of the affiliates' Keyword snippets, that are
+# marked with an "[Affiliate Link]" suffix in generated posts.
+AFFILIATE_KEYWORDS = []
+
+# Inference backend used for text generation on CPU:
+#   "pytorch"       - fp32 PyTorch (default)
+#   "pytorch-int8"  - PyTorch with dynamic int8 quantization of linear layers
+#   "onnx"          - ONNX Runtime via Optimum (pip install optimum[onnxruntime])
+# Run "manage.py benchmark_inference_backends" to compare them on a machine.
+AUTO_BLOG_INFERENCE_BACKEND = "pytorch"
+
+# Where the ONNX backend keeps exported models between worker restarts.
+AUTO_BLOG_ONNX_EXPORT_DIR = os.path.join(BASE_DIR, "onnx_models")
+
+# The model is loaded lazily on first use in each process. While this is
+# True, Celery worker processes load it eagerly at start-up instead so the
+# first generation task does not pay for it. Only enable it in the
+# settings of a worker dedicated to generation tasks: every pool process
+# of a worker would otherwise load the model, including those that only
+# flush clicks. Web workers and management commands never load the model
+# either way.
+AUTO_BLOG_PRELOAD_MODEL = False
+
+# Generate all non-title sections of a post in a single left-padded batch
+# rather than one forward pass per section.
+AUTO_BLOG_BATCH_SECTIONS = True
+
+# Number of candidates sampled per section in one batched call; the first
+# one that passes the coherence check is used, or the closest one if none
+# does (there is no retry). 1 restores the sequential behaviour of up to
+# five one-sequence attempts.
+AUTO_BLOG_COHERENCE_CANDIDATES = 4
+
+# Blog listings
+# Posts shown per page of a blog index or tag page. Listings (and each
+# tag's list of posts) are cached for BLOG_LISTING_CACHE_TIMEOUT seconds,
+# or until a post is published or unpublished.
+BLOG_INDEX_PAGE_SIZE = 12
+BLOG_TAG_PAGE_SIZE = 12
+BLOG_LISTING_CACHE_TIMEOUT = 60 * 60
+
+# Rendered home, blog index, tag and post pages are cached for anonymous
+# visitors for this many seconds. Publishing or unpublishing a post purges
+# it and every page that lists posts. 0 disables the page cache.
+FULL_PAGE_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Static export
+# When set, live blog posts, blog indexes and home pages are rendered to
+# static HTML files in this directory STATIC_EXPORT_DELAY seconds after a
+# page is published or unpublished (see also "manage.py
+# export_static_site"). Publishes within that delay share one export, and
+# only pages published since the last export are rendered again. An
+# export holds a lock for up to STATIC_EXPORT_LOCK_TIMEOUT seconds.
+STATIC_EXPORT_DIR = None
+STATIC_EXPORT_DELAY = 60
+STATIC_EXPORT_LOCK_TIMEOUT = 60 * 60
+
 # Logging
 # Add to your settings.py
 LOGGING = {
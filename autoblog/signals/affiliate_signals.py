@@ -0,0 +1,20 @@
+# autoblog/signals/affiliate_signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from ..models.affiliate_models import Affiliate, Keyword
+from ..utils.affiliate_linker import invalidate_affiliate_linker
+from ..utils.redirect_cache import invalidate_affiliate_link
+
+
+@receiver(post_save, sender=Keyword)
+@receiver(post_delete, sender=Keyword)
+@receiver(post_delete, sender=Affiliate)
+def keywords_changed(sender, **kwargs):
+    invalidate_affiliate_linker()
+
+
+@receiver(post_save, sender=Affiliate)
+@receiver(post_delete, sender=Affiliate)
+def affiliate_changed(sender, instance, **kwargs):
+    invalidate_affiliate_link(instance.pk)
@@ -0,0 +1,77 @@
+# autoblog/signals/blog_signals.py
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from wagtail.signals import page_published, page_unpublished
+
+from ..models.blog_models import BlogIndexPage, BlogPage, BlogTagIndexPage
+from ..models.home_models import HomePage
+from ..tasks.export_tasks import schedule_static_export
+from ..utils.blog_cache import invalidate_blog_listings
+from ..utils.page_cache import FullPageCacheMixin, purge_pages
+from ..utils.static_export import EXPORTED_PAGE_TYPES
+
+
+LISTING_PAGE_TYPES = (BlogIndexPage, BlogTagIndexPage, HomePage)
+LISTING_PAGE_IDS_CACHE_KEY = "autoblog:listing-page-ids"
+
+
+def listing_page_ids():
+    """
+    Ids of the pages that list blog posts. Cached until one of them is
+    published, unpublished or deleted, so a bulk publish does not query
+    them once per post.
+    """
+    page_ids = cache.get(LISTING_PAGE_IDS_CACHE_KEY)
+    if page_ids is None:
+        page_ids = [
+            page_id
+            for page_type in LISTING_PAGE_TYPES
+            for page_id in page_type.objects.values_list('id', flat=True)
+        ]
+        cache.set(LISTING_PAGE_IDS_CACHE_KEY, page_ids, timeout=None)
+    return page_ids
+
+
+@receiver(page_published, sender=BlogPage)
+@receiver(page_unpublished, sender=BlogPage)
+@receiver(post_delete, sender=BlogPage)
+def blog_page_changed(sender, instance, **kwargs):
+    invalidate_blog_listings()
+    purge_pages([instance.pk, *listing_page_ids()])
+
+
+def blog_pages_updated(page_ids):
+    """
+    Refresh everything derived from the live content of ``page_ids`` after
+    it was changed without a publish (no ``page_published`` is sent).
+    """
+    invalidate_blog_listings()
+    purge_pages([*page_ids, *listing_page_ids()])
+    if settings.STATIC_EXPORT_DIR:
+        schedule_static_export()
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+def cached_page_changed(sender, instance, **kwargs):
+    if isinstance(instance, FullPageCacheMixin) and sender is not BlogPage:
+        purge_pages([instance.pk])
+    if isinstance(instance, LISTING_PAGE_TYPES):
+        cache.delete(LISTING_PAGE_IDS_CACHE_KEY)
+
+
+@receiver(post_delete, sender=BlogIndexPage)
+@receiver(post_delete, sender=BlogTagIndexPage)
+@receiver(post_delete, sender=HomePage)
+def listing_page_deleted(sender, **kwargs):
+    cache.delete(LISTING_PAGE_IDS_CACHE_KEY)
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+def exported_page_changed(sender, instance, **kwargs):
+    if settings.STATIC_EXPORT_DIR and isinstance(
+            instance, EXPORTED_PAGE_TYPES):
+        schedule_static_export()
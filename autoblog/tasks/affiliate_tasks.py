@@ -0,0 +1,112 @@
+# autoblog/tasks/affiliate_tasks.py
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ..models.affiliate_models import Affiliate, AffiliateClick, Keyword
+from ..models.blog_models import BlogPage
+from ..utils.click_buffer import ack_clicks, drain_clicks, flush_lock
+from ..utils.click_retention import archive_clicks
+from ..utils.click_rollups import rollup_clicks
+from ..utils.user_agents import normalize_ip, resolve_user_agents
+
+logger = logging.getLogger(__name__)
+
+
+def save_clicks(clicks):
+    """
+    Write a batch of buffered clicks with a single bulk insert and add
+    them to the rollups in the same transaction.
+    """
+    affiliate_ids = set(
+        Affiliate.objects.filter(
+            id__in={click['affiliate_id'] for click in clicks}
+        ).values_list('id', flat=True)
+    )
+    # Signed clicks only carry ids; resolve them for the whole batch at once.
+    keywords = dict(
+        Keyword.objects.filter(
+            id__in={click.get('keyword_id') for click in clicks} - {None}
+        ).values_list('id', 'keyword')
+    )
+    user_agent_ids = resolve_user_agents(
+        click['user_agent'] for click in clicks)
+    post_ids = set(
+        BlogPage.objects.filter(
+            id__in={click.get('post_id') for click in clicks} - {None}
+        ).values_list('id', flat=True)
+    )
+
+    rows = [
+        AffiliateClick(
+            affiliate_id=click['affiliate_id'],
+            affiliate_product=(
+                click.get('affiliate_product')
+                or keywords.get(click.get('keyword_id'))
+                or "Unknown"
+            ),
+            post_id=click.get('post_id') if click.get('post_id') in post_ids else None,
+            ip_address=normalize_ip(click['ip_address']),
+            user_agent_id=user_agent_ids[click['user_agent']],
+            click_time=parse_datetime(click['click_time']),
+        )
+        for click in clicks
+        # The affiliate may have been deleted since the click was buffered.
+        if click['affiliate_id'] in affiliate_ids
+    ]
+    with transaction.atomic():
+        AffiliateClick.objects.bulk_create(rows)
+        rollup_clicks(rows)
+    return rows
+
+
+@shared_task
+def flush_affiliate_clicks():
+    """Move every buffered click into the database in bulk batches."""
+    batch_size = settings.AFFILIATE_CLICK_FLUSH_BATCH_SIZE
+    flushed = 0
+
+    lock = flush_lock()
+    if not lock.acquire(blocking=False):
+        logger.debug("Another flush is running; skipping")
+        return flushed
+
+    try:
+        while True:
+            clicks = drain_clicks(batch_size)
+            if not clicks:
+                break
+
+            # On failure the batch stays claimed and is retried first by
+            # the next flush.
+            flushed += len(save_clicks(clicks))
+            ack_clicks()
+            lock.reacquire()
+
+            if len(clicks) < batch_size:
+                break
+    finally:
+        lock.release()
+
+    logger.info("Flushed %d affiliate clicks", flushed)
+    return flushed
+
+
+@shared_task
+def archive_affiliate_clicks(retention_days=None):
+    """
+    Move clicks older than the retention window out of the database and
+    into the compressed monthly archive files.
+    """
+    retention_days = retention_days or settings.AFFILIATE_CLICK_RETENTION_DAYS
+    return archive_clicks(
+        before=timezone.now() - timedelta(days=retention_days),
+        archive_dir=settings.AFFILIATE_CLICK_ARCHIVE_DIR,
+        batch_size=settings.AFFILIATE_CLICK_ARCHIVE_BATCH_SIZE,
+    )
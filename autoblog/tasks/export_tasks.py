@@ -0,0 +1,47 @@
+# autoblog/tasks/export_tasks.py
+import logging
+
+from celery import shared_task
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from ..utils.static_export import export_lock, export_static_pages
+
+logger = logging.getLogger(__name__)
+
+PENDING_CACHE_KEY = "autoblog:static-export:pending"
+
+
+def schedule_static_export():
+    """
+    Queue an export STATIC_EXPORT_DELAY seconds after the current
+    transaction commits, unless one is already queued. Bulk publishes
+    (a nightly batch, relink_blog_pages) then cause a single export.
+    """
+    def schedule():
+        # The key normally goes when the export starts; the timeout only
+        # matters if the queued task is lost.
+        if cache.add(PENDING_CACHE_KEY, 1,
+                     timeout=settings.STATIC_EXPORT_DELAY * 10):
+            export_static_site.apply_async(
+                countdown=settings.STATIC_EXPORT_DELAY)
+
+    transaction.on_commit(schedule)
+
+
+@shared_task(bind=True, max_retries=None)
+def export_static_site(self, force=False):
+    """Re-render changed pages into STATIC_EXPORT_DIR."""
+    if not settings.STATIC_EXPORT_DIR:
+        logger.debug("STATIC_EXPORT_DIR is not set; skipping static export")
+        return None
+
+    # Publishes from now on need another export to be picked up.
+    cache.delete(PENDING_CACHE_KEY)
+    with export_lock() as acquired:
+        if not acquired:
+            logger.debug("Another static export is running; retrying later")
+            raise self.retry(countdown=settings.STATIC_EXPORT_DELAY)
+        return export_static_pages(settings.STATIC_EXPORT_DIR, force=force)
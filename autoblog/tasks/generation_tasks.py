@@ -1,81 +1,29 @@
 # blog/tasks.py
+import copy
 import logging
+import random
+import zlib
 
-from celery import shared_task
+from celery import chord, shared_task
 
+from django.db import transaction
 from django.utils import timezone
 from django.conf import settings
 
-from transformers import pipeline, AutoTokenizer
-from transformers.generation import GenerationConfig
-
 from ..models.blog_models import BlogPage, BlogIndexPage
-from ..wagtail_hooks.generation_hooks import GenerationState, Affiliate
+from ..models.affiliate_models import Affiliate
+from ..models.generation_models import GenerationRun, GenerationState
+from ..utils.affiliate_linker import get_affiliate_linker
+from ..utils.generation_cache import (
+    cache_generations,
+    generation_cache_key,
+    get_cached_generations,
+)
+from ..utils.model_registry import registry
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)  # Ensure debug messages are captured
 
-try:
-    logger.debug("Initializing tokenizer with model: %s",
-                 settings.AUTO_BLOG_MODEL_NAME)
-    tokenizer = AutoTokenizer.from_pretrained(settings.AUTO_BLOG_MODEL_NAME)
-    if tokenizer.pad_token is None:
-        logger.debug("No pad_token found, setting to eos_token or [PAD]")
-        tokenizer.pad_token = tokenizer.eos_token or "[PAD]"
-except Exception as e:
-    logger.error(f"Failed to initialize tokenizer: {str(e)}")
-    raise
-
-logger.debug("Setting tokenizer padding_side to 'left'")
-tokenizer.padding_side = "left"
-
-logger.debug("Initializing text-generation pipeline")
-generator = pipeline(
-    'text-generation',
-    model=settings.AUTO_BLOG_MODEL_NAME,
-    device=-1,
-    tokenizer=tokenizer,
-    truncation=True,
-    padding='max_length',
-    generation_kwargs={
-        'return_full_text': False,
-        'clean_up_tokenization_spaces': True,
-        'stop_sequence': ['\n\n', '##', '---']
-    }
-)
-logger.debug("Text-generation pipeline initialized successfully")
-
-body_generation_config = GenerationConfig(
-    max_new_tokens=400,
-    min_new_tokens=50,
-    do_sample=True,
-    temperature=0.7,
-    top_k=50,
-    top_p=0.95,
-    num_beams=3,
-    early_stopping=True,
-    eos_token_id=tokenizer.eos_token_id,
-    pad_token_id=tokenizer.eos_token_id
-)
-logger.debug("Body generation config created: %s", body_generation_config)
-
-title_generation_config = GenerationConfig(
-    max_new_tokens=15,
-    min_new_tokens=5,
-    do_sample=True,
-    temperature=0.7,
-    top_k=20,
-    top_p=0.85,
-    num_beams=3,
-    no_repeat_ngram_size=2,
-    early_stopping=True,
-    eos_token_id=tokenizer.eos_token_id,
-    pad_token_id=tokenizer.eos_token_id,
-    length_penalty=1.5,
-    repetition_penalty=1.2
-)
-logger.debug("Title generation config created: %s", title_generation_config)
-
 
 def clean_generated_text(text):
     logger.debug("Cleaning generated text: %s",
@@ -87,25 +35,63 @@ def clean_generated_text(text):
     return text.strip()
 
 
-def generate_with_sentence_boundaries(prompt_text, max_new_tokens=300, config=body_generation_config):
-    logger.debug("Generating text with sentence boundaries for prompt: %s",
-                 prompt_text[:100] + "..." if len(prompt_text) > 100 else prompt_text)
+def candidate_generation_config(config, num_candidates):
+    """
+    Copy of ``config`` that samples ``num_candidates`` independent
+    sequences per prompt. Beam search would return near-duplicate beams,
+    so candidates are drawn with plain sampling instead.
+    """
+    candidate_config = copy.deepcopy(config)
+    candidate_config.do_sample = True
+    candidate_config.num_beams = 1
+    candidate_config.early_stopping = False
+    candidate_config.num_return_sequences = num_candidates
+    return candidate_config
+
+
+def generate_with_sentence_boundaries(prompt_text, max_new_tokens=300, config=None, num_candidates=1):
+    """
+    Generate continuations of ``prompt_text``, each truncated to its last
+    complete sentence, and return them as a list. With ``num_candidates``
+    > 1 that many sequences are sampled in a single batched call.
+    """
+    from ..utils.stopping_criteria import sentence_stopping_criteria
+
+    if config is None:
+        config = registry.body_generation_config
+    tokenizer = registry.tokenizer
+    generator = registry.generator
+
+    logger.debug("Generating %d candidate(s) with sentence boundaries for prompt: %s",
+                 num_candidates, prompt_text[:100] + "..." if len(prompt_text) > 100 else prompt_text)
     logger.debug("Max new tokens: %d, Config: %s", max_new_tokens, config)
 
-    max_output_length = max_new_tokens + len(prompt_text) // 2
-    config.max_new_tokens = max_output_length
-    generator.generation_config = config
+    if num_candidates > 1:
+        config = candidate_generation_config(config, num_candidates)
+    else:
+        config = copy.deepcopy(config)
+    config.max_new_tokens = max_new_tokens + len(prompt_text) // 2
 
     logger.debug("Tokenizing input")
-    inputs = tokenizer.tokenize(prompt_text, return_tensors="pt",
-                                padding=True, truncation=True)
+    prompt_length = len(tokenizer(prompt_text, truncation=True)['input_ids'])
 
     logger.debug("Generating text")
-    outputs = generator(inputs)
-    generated = tokenizer.decode(outputs[0], skip_special_tokens=True)
+    outputs = generator(
+        prompt_text,
+        return_full_text=False,
+        clean_up_tokenization_spaces=True,
+        generation_config=config,
+        stopping_criteria=sentence_stopping_criteria(
+            tokenizer, prompt_length, config.min_new_tokens),
+    )
+    generated = [output['generated_text'] for output in outputs]
     logger.debug("Raw generated text: %s",
-                 generated[:200] + "..." if len(generated) > 200 else generated)
+                 generated[0][:200] + "..." if len(generated[0]) > 200 else generated[0])
+
+    return [truncate_to_sentence_boundary(text) for text in generated]
 
+
+def truncate_to_sentence_boundary(generated):
     # Find last complete sentence
     last_period = generated.rfind('.')
     last_question = generated.rfind('?')
@@ -120,16 +106,64 @@ def generate_with_sentence_boundaries(prompt_text, max_new_tokens=300, config=bo
     return generated
 
 
-def generate_by_paragraphs(prompt_text, paragraphs=3):
+def generate_batch_with_sentence_boundaries(prompt_texts, max_new_tokens=300, config=None, num_return_sequences=1):
+    """
+    Generate a continuation for every prompt in ``prompt_texts`` with a
+    single left-padded ``generate`` call. Results are returned in the same
+    order as the prompts; with ``num_return_sequences`` > 1 each prompt's
+    candidates are returned next to each other.
+    """
+    from ..utils.stopping_criteria import sentence_stopping_criteria
+
+    if config is None:
+        config = registry.body_generation_config
+    tokenizer = registry.tokenizer
+    model = registry.model
+
+    logger.debug("Generating batch of %d prompts with sentence boundaries",
+                 len(prompt_texts))
+
+    if num_return_sequences > 1:
+        batch_config = candidate_generation_config(
+            config, num_return_sequences)
+    else:
+        batch_config = copy.deepcopy(config)
+    batch_config.max_new_tokens = max_new_tokens + \
+        max(len(p) for p in prompt_texts) // 2
+    logger.debug("Max new tokens: %d, Config: %s",
+                 batch_config.max_new_tokens, batch_config)
+
+    logger.debug("Tokenizing batch input")
+    inputs = tokenizer(prompt_texts, return_tensors="pt",
+                       padding=True, truncation=True)
+    prompt_length = inputs['input_ids'].shape[-1]
+
+    logger.debug("Generating batch text")
+    outputs = model.generate(
+        **inputs,
+        generation_config=batch_config,
+        stopping_criteria=sentence_stopping_criteria(
+            tokenizer, prompt_length, batch_config.min_new_tokens),
+    )
+    generated = tokenizer.batch_decode(
+        outputs[:, prompt_length:], skip_special_tokens=True)
+
+    return [truncate_to_sentence_boundary(text) for text in generated]
+
+
+def generate_by_paragraphs(prompt_text, paragraphs=3, reuse_cache=True):
     logger.debug("Generating by paragraphs (count: %d) for prompt: %s",
                  paragraphs, prompt_text[:100] + "..." if len(prompt_text) > 100 else prompt_text)
+    if reuse_cache and registry.supports_cache_reuse:
+        return _generate_by_paragraphs_streaming(prompt_text, paragraphs)
+
     full_text = ""
     for i in range(paragraphs):
         logger.debug("Generating paragraph %d/%d", i+1, paragraphs)
         chunk = generate_with_sentence_boundaries(
             prompt_text + full_text,
             max_new_tokens=100
-        )
+        )[0]
         logger.debug("Generated chunk %d: %s", i+1,
                      chunk[:200] + "..." if len(chunk) > 200 else chunk)
         full_text += "\n\n" + chunk.split(prompt_text)[-1].strip()
@@ -137,6 +171,79 @@ def generate_by_paragraphs(prompt_text, paragraphs=3):
     return prompt_text + full_text
 
 
+def _generate_by_paragraphs_streaming(prompt_text, paragraphs):
+    """
+    Continuation mode for ``generate_by_paragraphs`` that carries the
+    key/value cache from one paragraph to the next, so each step only
+    feeds the paragraph separator instead of re-encoding the prompt and
+    every paragraph generated so far.
+    """
+    import torch
+    from transformers import DynamicCache
+
+    from ..utils.stopping_criteria import sentence_stopping_criteria
+
+    tokenizer = registry.tokenizer
+    model = registry.model
+
+    # Beam search expands and reorders the cache per beam, so a single
+    # sampled stream is needed to carry it across paragraphs.
+    config = copy.deepcopy(registry.body_generation_config)
+    config.max_new_tokens = 100
+    config.num_beams = 1
+    config.early_stopping = False
+    logger.debug("Streaming paragraph config: %s", config)
+
+    separator_ids = tokenizer(
+        "\n\n", return_tensors="pt")['input_ids']
+    input_ids = tokenizer(
+        prompt_text, return_tensors="pt", truncation=True)['input_ids']
+    past_key_values = DynamicCache()
+
+    full_text = ""
+    for i in range(paragraphs):
+        logger.debug("Generating paragraph %d/%d (%d tokens in context)",
+                     i+1, paragraphs, input_ids.shape[-1])
+        outputs = model.generate(
+            input_ids=input_ids,
+            attention_mask=torch.ones_like(input_ids),
+            past_key_values=past_key_values,
+            generation_config=config,
+            return_dict_in_generate=True,
+            use_cache=True,
+            stopping_criteria=sentence_stopping_criteria(
+                tokenizer, input_ids.shape[-1], config.min_new_tokens),
+        )
+        past_key_values = outputs.past_key_values
+
+        new_tokens = outputs.sequences[0, input_ids.shape[-1]:]
+        kept = _sentence_boundary_token_count(tokenizer, new_tokens)
+        chunk = tokenizer.decode(new_tokens[:kept], skip_special_tokens=True)
+        logger.debug("Generated chunk %d: %s", i+1,
+                     chunk[:200] + "..." if len(chunk) > 200 else chunk)
+        full_text += "\n\n" + chunk.strip()
+
+        # Drop whatever was generated past the last sentence boundary from
+        # both the context and the cache, then only the separator has to
+        # be fed for the next paragraph.
+        context_length = input_ids.shape[-1] + kept
+        past_key_values.crop(context_length)
+        input_ids = torch.cat(
+            [outputs.sequences[:, :context_length], separator_ids], dim=-1)
+
+    logger.debug("Completed paragraph generation")
+    return prompt_text + full_text
+
+
+def _sentence_boundary_token_count(tokenizer, tokens):
+    """Number of leading ``tokens`` that end on a sentence boundary."""
+    for count in range(len(tokens), 0, -1):
+        text = tokenizer.decode(tokens[:count], skip_special_tokens=True)
+        if text.rstrip().endswith(('.', '?', '!')):
+            return count
+    return len(tokens)
+
+
 def is_coherent(clean_text, min_sentences=2):
     logger.debug("Checking coherence for text: %s",
                  clean_text[:200] + "..." if len(clean_text) > 200 else clean_text)
@@ -148,31 +255,53 @@ def is_coherent(clean_text, min_sentences=2):
     return coherence
 
 
+def best_candidate(clean_texts):
+    """
+    The candidate closest to passing ``is_coherent``: the one with the
+    most sentences of more than three words.
+    """
+    def score(text):
+        sentences = [s.strip() for s in text.split('.') if s.strip()]
+        return sum(len(s.split()) > 3 for s in sentences)
+    return max(clean_texts, key=score)
+
+
 def generate_coherent_text(
     prompt_text: str,
     max_attempts: int = 3,
     current_attempt: int = 1,
+    candidates: int = 1,
     **generation_kwargs
 ) -> str:
+    """
+    With ``candidates`` > 1, each attempt samples that many continuations
+    in one batched call and returns the first one that passes
+    ``is_coherent``, rather than decoding a single sequence per attempt.
+    """
     logger.debug("Generating coherent text (attempt %d/%d) for prompt: %s",
                  current_attempt, max_attempts, prompt_text[:100] + "..." if len(prompt_text) > 100 else prompt_text)
     logger.debug("Generation kwargs: %s", generation_kwargs)
 
-    generated_text = generate_with_sentence_boundaries(
+    generated_texts = generate_with_sentence_boundaries(
         prompt_text,
         max_new_tokens=generation_kwargs.get('max_length', 300),
-        config=generation_kwargs.get('config', body_generation_config)
+        config=generation_kwargs.get('config'),
+        num_candidates=candidates,
     )
-    logger.debug("Generated text (pre-clean): %s",
-                 generated_text[:200] + "..." if len(generated_text) > 200 else generated_text)
 
-    clean_text = clean_generated_text(generated_text)
-    logger.debug("Cleaned text: %s",
-                 clean_text[:200] + "..." if len(clean_text) > 200 else clean_text)
+    clean_texts = []
+    for generated_text in generated_texts:
+        logger.debug("Generated text (pre-clean): %s",
+                     generated_text[:200] + "..." if len(generated_text) > 200 else generated_text)
 
-    if is_coherent(clean_text):
-        logger.debug("Text is coherent, returning")
-        return clean_text
+        clean_text = clean_generated_text(generated_text)
+        logger.debug("Cleaned text: %s",
+                     clean_text[:200] + "..." if len(clean_text) > 200 else clean_text)
+
+        if is_coherent(clean_text):
+            logger.debug("Text is coherent, returning")
+            return clean_text
+        clean_texts.append(clean_text)
 
     if current_attempt < max_attempts:
         logger.warning(
@@ -182,190 +311,467 @@ def generate_coherent_text(
             prompt_text,
             max_attempts=max_attempts,
             current_attempt=current_attempt + 1,
+            candidates=candidates,
             **generation_kwargs
         )
 
     logger.error(
         "Max regeneration attempts reached. Returning best available.")
-    return clean_text
+    return best_candidate(clean_texts)
 
 
-@shared_task(bind=True)
-def generate_daily_blog_post(self):
-    logger.info("Starting daily blog post generation")
+def generate_coherent_batch(
+    prompt_texts: list,
+    max_attempts: int = 3,
+    candidates: int = 1,
+    **generation_kwargs
+) -> list:
+    """
+    Batched counterpart of ``generate_coherent_text``. Every attempt after
+    the first only regenerates the prompts whose output failed
+    ``is_coherent``, again as a single batch.
+    """
+    logger.debug("Generating coherent batch of %d prompts (%d candidates each)",
+                 len(prompt_texts), candidates)
+    logger.debug("Generation kwargs: %s", generation_kwargs)
 
-    try:
-        logger.debug("Retrieving or creating GenerationState")
-        state, _ = GenerationState.objects.get_or_create(id=1)
-        logger.debug("Generation state: %s", state)
+    results = [None] * len(prompt_texts)
+    pending = list(range(len(prompt_texts)))
 
-        logger.debug("Retrieving affiliates ordered by ID")
-        affiliates = list(Affiliate.objects.order_by('id'))
-        n_affiliates = len(affiliates)
-        logger.debug("Found %d affiliates: %s", n_affiliates,
-                     [a.name for a in affiliates])
+    for attempt in range(1, max_attempts + 1):
+        generated = generate_batch_with_sentence_boundaries(
+            [prompt_texts[i] for i in pending],
+            max_new_tokens=generation_kwargs.get('max_length', 300),
+            config=generation_kwargs.get('config'),
+            num_return_sequences=candidates
+        )
 
-        if not affiliates:
-            logger.warning("No affiliates retrieved. Exiting.")
-            return
+        failed = []
+        for n, i in enumerate(pending):
+            clean_texts = [
+                clean_generated_text(generated_text) for generated_text
+                in generated[n * candidates:(n + 1) * candidates]
+            ]
+            coherent = [text for text in clean_texts if is_coherent(text)]
+            if coherent:
+                results[i] = coherent[0]
+            else:
+                results[i] = best_candidate(clean_texts)
+                failed.append(i)
 
-        current_aff_index = 0
-        if state.last_affiliate:
-            logger.debug("Last affiliate found in state: %s (ID: %d)",
-                         state.last_affiliate.name, state.last_affiliate.id)
-            for i, a in enumerate(affiliates):
-                if a.id == state.last_affiliate.id:
-                    current_aff_index = i
-                    break
-        logger.debug("Current affiliate index: %d", current_aff_index)
-
-        current_affiliate = affiliates[current_aff_index]
-        logger.debug("Current affiliate: %s (ID: %d)",
-                     current_affiliate.name, current_affiliate.id)
-
-        logger.debug("Retrieving keywords for current affiliate")
-        keywords = list(current_affiliate.keywords.order_by('id'))
-        n_keywords = len(keywords)
-        logger.debug("Found %d keywords: %s", n_keywords,
-                     [k.keyword for k in keywords])
-
-        if not keywords:
-            logger.warning("No keywords found for affiliate %s",
-                           current_affiliate.name)
-            return
+        if not failed:
+            logger.debug("All batch texts are coherent, returning")
+            return results
 
-        current_key_index = 0
-        if state.last_keyword:
-            logger.debug("Last keyword found in state: %s (ID: %d)",
-                         state.last_keyword.keyword, state.last_keyword.id)
-            for i, k in enumerate(keywords):
-                if k.id == state.last_keyword.id:
-                    current_key_index = i + 1
-                    break
-
-        logger.debug("Current keyword index: %d", current_key_index)
-
-        if current_key_index >= len(keywords):
-            logger.debug(
-                "Keyword index exceeds available keywords, moving to next affiliate")
-            current_aff_index = (current_aff_index + 1) % len(affiliates)
-            current_affiliate = affiliates[current_aff_index]
-            logger.debug("New current affiliate: %s (ID: %d)",
-                         current_affiliate.name, current_affiliate.id)
-            keywords = list(current_affiliate.keywords.order_by('id'))
-            current_key_index = 0
-            logger.debug("Reset keyword index to 0 for new affiliate")
-
-        if not keywords:
+        if attempt < max_attempts:
             logger.warning(
-                "No keywords found for new affiliate %s", current_affiliate.name)
-            return
+                f"Text coherence check failed for {len(failed)} prompts (attempt {attempt}). Regenerating..."
+            )
+        pending = failed
 
-        current_keyword = keywords[current_key_index]
-        logger.debug("Current keyword: %s (ID: %d)",
-                     current_keyword.keyword, current_keyword.id)
-
-        logger.debug("Retrieving prompts for affiliate")
-        prompts = current_affiliate.prompts.all()
-        logger.debug("Found %d prompts: %s", len(
-            prompts), [p.section for p in prompts])
-
-        blog_content = []
-        sections = {
-            'title_prompt_text': None,
-            'intro': None,
-            'intro_prompt': True
-        }
-
-        for prompt in prompts:
-            logger.debug("Processing prompt for section: %s", prompt.section)
-            prompt_text = prompt.prompt_text.replace(
-                "{affiliate}", current_affiliate.name).replace("{keyword}", current_keyword.keyword)
-            logger.debug("Processed prompt text: %s",
-                         prompt_text[:200] + "..." if len(prompt_text) > 200 else prompt_text)
-
-            if prompt.section != 'T':
-                logger.debug("Generating content for non-title section")
-                coherent_text = generate_coherent_text(
-                    prompt_text, max_attempts=5)
-                logger.debug("Generated coherent text for section %s: %s",
-                             prompt.section, coherent_text[:200] + "..." if len(coherent_text) > 200 else coherent_text)
-
-                if sections.get('intro_prompt'):
-                    logger.debug("Setting intro section text")
-                    sections['intro'] = coherent_text
-                    sections['intro_prompt'] = False
-
-                blog_content.append(coherent_text)
-            else:
-                logger.debug("Setting title prompt text")
-                sections['title_prompt_text'] = prompt_text
-
-        full_post = "\n\n".join(blog_content)
-        logger.debug("Full post content (pre-link processing): %s",
-                     full_post[:500] + "..." if len(full_post) > 500 else full_post)
-
-        logger.debug("Generating title")
-        post_title = generate_coherent_text(
-            sections['title_prompt_text'], max_attempts=5, config=title_generation_config)
-        logger.debug("Generated title: %s", post_title)
-
-        logger.debug("Processing affiliate links")
-        processed_content = full_post
-        for keyword in settings.AFFILIATE_KEYWORDS:
-            logger.debug("Processing keyword: %s", keyword)
-            processed_content = processed_content.replace(
-                keyword, f"{keyword} [Affiliate Link]")
-        logger.debug("Content after link processing: %s",
-                     processed_content[:500] + "..." if len(processed_content) > 500 else processed_content)
-
-        logger.debug("Creating new BlogPage instance")
-        new_post = BlogPage(
-            title=post_title,
-            date=timezone.now(),
-            intro=sections['intro'],
-            body=processed_content,
+    logger.error(
+        "Max regeneration attempts reached. Returning best available.")
+    return results
+
+
+def generate_section_texts(prompt_texts, seed):
+    """
+    Generate the body sections for ``prompt_texts``, reusing any section
+    already generated for the same prompt, config and seed.
+    """
+    candidates = settings.AUTO_BLOG_COHERENCE_CANDIDATES
+    params = {
+        # A pool of candidates already costs about one batched decode, so
+        # it gets a single attempt; retrying it would multiply the work.
+        'max_attempts': 1 if candidates > 1 else 5,
+        'candidates': candidates,
+        'batched': settings.AUTO_BLOG_BATCH_SECTIONS,
+    }
+    keys = [
+        generation_cache_key(registry.model_name,
+                             registry.body_generation_config,
+                             prompt_text, seed, **params)
+        for prompt_text in prompt_texts
+    ]
+    texts = get_cached_generations(keys)
+    missing = [i for i, key in enumerate(keys) if key not in texts]
+    logger.debug("%d of %d sections need generating",
+                 len(missing), len(prompt_texts))
+
+    if missing:
+        registry.set_seed(seed)
+
+    if missing and settings.AUTO_BLOG_BATCH_SECTIONS:
+        logger.debug("Generating %d non-title sections as one batch",
+                     len(missing))
+        generated = generate_coherent_batch(
+            [prompt_texts[i] for i in missing],
+            max_attempts=params['max_attempts'],
+            candidates=params['candidates'])
+        generated = {keys[i]: text for i, text in zip(missing, generated)}
+        cache_generations(generated)
+        texts.update(generated)
+    else:
+        for i in missing:
+            logger.debug("Generating content for non-title section")
+            text = generate_coherent_text(
+                prompt_texts[i],
+                max_attempts=params['max_attempts'],
+                candidates=params['candidates'])
+            cache_generations({keys[i]: text})
+            texts[keys[i]] = text
+
+    return [texts[key] for key in keys]
+
+
+def generate_title_text(prompt_text, seed):
+    """Generate the post title, reusing a cached one for the same seed."""
+    config = registry.title_generation_config
+    key = generation_cache_key(registry.model_name, config,
+                               prompt_text, seed, max_attempts=5)
+    cached = get_cached_generations([key])
+    if key in cached:
+        return cached[key]
+
+    registry.set_seed(seed)
+    title = generate_coherent_text(prompt_text, max_attempts=5, config=config)
+    cache_generations({key: title})
+    return title
+
+
+def plan_rotation(count, state=None):
+    """
+    Plan the next ``count`` (affiliate, keyword) pairs of the rotation
+    that follows ``GenerationState``: every keyword of an affiliate in id
+    order, then on to the next affiliate, wrapping around at the end.
+    At most one full cycle is returned, so no pair is planned twice.
+    """
+    if state is None:
+        logger.debug("Retrieving or creating GenerationState")
+        state, _ = GenerationState.objects.get_or_create(id=1)
+    logger.debug("Generation state: %s", state)
+
+    logger.debug("Retrieving affiliates and keywords ordered by ID")
+    affiliates = list(
+        Affiliate.objects.order_by('id').prefetch_related('keywords'))
+    logger.debug("Found %d affiliates: %s", len(affiliates),
+                 [a.name for a in affiliates])
+
+    pairs = [
+        (affiliate, keyword)
+        for affiliate in affiliates
+        for keyword in sorted(affiliate.keywords.all(), key=lambda k: k.id)
+    ]
+    if not pairs:
+        logger.warning("No affiliate keywords retrieved. Exiting.")
+        return []
+
+    # None until a position is found; 0 is a valid position.
+    start = None
+    if state.last_affiliate_id:
+        for i, (affiliate, keyword) in enumerate(pairs):
+            if keyword.id == state.last_keyword_id:
+                start = i + 1
+                break
+            if affiliate.id == state.last_affiliate_id and start is None:
+                start = i
+    if start is None:
+        start = 0
+    logger.debug("Rotation starts at position %d of %d", start, len(pairs))
+
+    planned = [pairs[(start + i) % len(pairs)]
+               for i in range(min(count, len(pairs)))]
+    logger.debug("Planned pairs: %s",
+                 [(a.name, k.keyword) for a, k in planned])
+    return planned
+
+
+def claim_next_pairs(count):
+    """
+    Atomically claim the next ``count`` pairs of the rotation. The
+    ``GenerationState`` row is locked only while the pairs are planned and
+    the state is advanced past them, so concurrent workers each receive
+    different pairs without serializing the generation itself. On SQLite,
+    where ``select_for_update`` is a no-op, the same guarantee comes from
+    the IMMEDIATE transaction mode set in DATABASES.
+    """
+    GenerationState.objects.get_or_create(id=1)
+    with transaction.atomic():
+        state = GenerationState.objects.select_for_update().get(id=1)
+        pairs = plan_rotation(count, state=state)
+        if pairs:
+            state.last_affiliate, state.last_keyword = pairs[-1]
+            state.save()
+            logger.debug("Generation state advanced to: %s", state)
+    return pairs
+
+
+def select_next_pair():
+    """
+    Claim the next (affiliate, keyword) pair in the ``GenerationState``
+    rotation, or ``None`` if there is nothing to generate.
+    """
+    claimed = claim_next_pairs(1)
+    return claimed[0] if claimed else None
+
+
+def render_prompts(affiliate, keyword):
+    """
+    Substitute the affiliate and keyword into the affiliate's prompts.
+    Returns the ``(section, prompt_text)`` pairs for the body sections and
+    the title prompt text.
+    """
+    logger.debug("Retrieving prompts for affiliate")
+    prompts = affiliate.prompts.all()
+    logger.debug("Found %d prompts: %s", len(
+        prompts), [p.section for p in prompts])
+
+    section_prompts = []
+    title_prompt_text = None
+    for prompt in prompts:
+        logger.debug("Processing prompt for section: %s", prompt.section)
+        prompt_text = prompt.prompt_text.replace(
+            "{affiliate}", affiliate.name).replace("{keyword}", keyword.keyword)
+        logger.debug("Processed prompt text: %s",
+                     prompt_text[:200] + "..." if len(prompt_text) > 200 else prompt_text)
+
+        if prompt.section != 'T':
+            section_prompts.append((prompt.section, prompt_text))
+        else:
+            logger.debug("Setting title prompt text")
+            title_prompt_text = prompt_text
+
+    return section_prompts, title_prompt_text
+
+
+def plan_generation_run(task_id, seed=None, pair=None):
+    """
+    Return the run for ``task_id`` if a previous attempt already planned
+    one, otherwise plan a new run for ``pair`` (by default the next pair
+    in the rotation).
+    """
+    if task_id:
+        run = GenerationRun.objects.filter(task_id=task_id).first()
+        if run is not None:
+            logger.debug("Resuming generation run %d at stage: %s",
+                         run.id, run.get_stage_display())
+            return run
+
+    if seed is None:
+        if task_id:
+            seed = zlib.crc32(task_id.encode('utf-8'))
+        else:
+            seed = random.randrange(2 ** 32)
+
+    # Claiming the pair and recording the run commit together, so a pair
+    # is never claimed without a run to show for it.
+    with transaction.atomic():
+        if pair is None:
+            pair = select_next_pair()
+        if pair is None:
+            return None
+        affiliate, keyword = pair
+
+        run = GenerationRun.objects.create(
+            task_id=task_id,
+            affiliate=affiliate,
+            keyword=keyword,
+            seed=seed,
         )
-        logger.debug("BlogPage instance created: %s", new_post)
+    logger.debug("Planned generation run %d with seed %d", run.id, seed)
+    return run
 
-        logger.debug("Retrieving BlogIndexPage")
-        index_page = BlogIndexPage.objects.first()
-        if not index_page:
-            logger.error("No BlogIndexPage found!")
-            raise ValueError("Missing BlogIndexPage")
-        logger.debug("Found BlogIndexPage: %s", index_page)
 
-        logger.debug("Saving new post")
-        new_post.save()
-        logger.debug("Post saved with ID: %d", new_post.id)
+def generate_sections_stage(run):
+    section_prompts, _ = render_prompts(run.affiliate, run.keyword)
+    section_texts = generate_section_texts(
+        [prompt_text for _, prompt_text in section_prompts], run.seed)
+
+    intro = None
+    blog_content = []
+    for (section, _), coherent_text in zip(section_prompts, section_texts):
+        logger.debug("Generated coherent text for section %s: %s",
+                     section, coherent_text[:200] + "..." if len(coherent_text) > 200 else coherent_text)
+
+        if intro is None:
+            logger.debug("Setting intro section text")
+            intro = coherent_text
+
+        blog_content.append(coherent_text)
+
+    full_post = "\n\n".join(blog_content)
+    logger.debug("Full post content (pre-link processing): %s",
+                 full_post[:500] + "..." if len(full_post) > 500 else full_post)
+
+    run.advance(GenerationRun.SECTIONS_GENERATED,
+                intro=intro or "", body=full_post)
 
+
+def generate_title_stage(run):
+    _, title_prompt_text = render_prompts(run.affiliate, run.keyword)
+
+    logger.debug("Generating title")
+    post_title = generate_title_text(title_prompt_text, run.seed)
+    logger.debug("Generated title: %s", post_title)
+
+    run.advance(GenerationRun.TITLE_GENERATED, title=post_title)
+
+
+def process_links_stage(run):
+    # Runs after the page is saved so every link can carry the post id.
+    logger.debug("Processing affiliate links")
+    processed_content = get_affiliate_linker().link(
+        run.body, post_id=run.post_id)
+    logger.debug("Content after link processing: %s",
+                 processed_content[:500] + "..." if len(processed_content) > 500 else processed_content)
+
+    with transaction.atomic():
+        BlogPage.objects.filter(pk=run.post_id).update(body=processed_content)
+        run.advance(GenerationRun.LINKS_PROCESSED, body=processed_content)
+
+
+def save_page_stage(run):
+    logger.debug("Creating new BlogPage instance")
+    # Kept as a draft until its links are in and the revision is published.
+    new_post = BlogPage(
+        title=run.title,
+        date=timezone.now(),
+        intro=run.intro,
+        body=run.body,
+        live=False,
+    )
+    logger.debug("BlogPage instance created: %s", new_post)
+
+    logger.debug("Retrieving BlogIndexPage")
+    index_page = BlogIndexPage.objects.first()
+    if not index_page:
+        logger.error("No BlogIndexPage found!")
+        raise ValueError("Missing BlogIndexPage")
+    logger.debug("Found BlogIndexPage: %s", index_page)
+
+    # The page and the checkpoint are committed together, so a retry never
+    # creates the same post twice.
+    with transaction.atomic():
         logger.debug("Adding post as child to index page")
-        try:
-            index_page.add_child(instance=new_post)
-            logger.debug("Post added as child successfully")
-        except AttributeError as e:
-            if "'NoneType' object has no attribute '_inc_path'" in str(e):
-                logger.debug("Handling case where index page has no children")
-                new_post.path = index_page.path + '0001'
-                new_post.depth = index_page.depth + 1
-                new_post.save()
-                logger.debug("Post saved with manual path: %s", new_post.path)
-            else:
-                logger.error("Error adding child: %s", str(e))
-                raise
+        index_page.add_child(instance=new_post)
+        logger.debug("Post saved with ID: %d", new_post.id)
+
+        run.advance(GenerationRun.PAGE_SAVED, post=new_post)
+
 
+def publish_revision_stage(run):
+    # Reload rather than use run.post: the linked body was written with a
+    # queryset update, so an instance cached on the run would publish the
+    # unlinked body.
+    new_post = BlogPage.objects.get(pk=run.post_id)
+
+    with transaction.atomic():
         logger.debug("Publishing post revision")
         new_post.save_revision().publish()
-        logger.info("Published new post: %s (ID: %d)",
-                    new_post.title, new_post.id)
+        run.advance(GenerationRun.PUBLISHED)
+
+    logger.info("Published new post: %s (ID: %d)",
+                new_post.title, new_post.id)
+
+
+GENERATION_STAGES = [
+    (GenerationRun.SECTIONS_GENERATED, generate_sections_stage),
+    (GenerationRun.TITLE_GENERATED, generate_title_stage),
+    (GenerationRun.PAGE_SAVED, save_page_stage),
+    (GenerationRun.LINKS_PROCESSED, process_links_stage),
+    (GenerationRun.PUBLISHED, publish_revision_stage),
+]
+
+
+def run_generation_stages(run):
+    for stage, run_stage in GENERATION_STAGES:
+        if run.stage >= stage:
+            logger.debug("Skipping completed stage: %s",
+                         dict(GenerationRun.STAGE_CHOICES)[stage])
+            continue
+        logger.debug("Running stage: %s",
+                     dict(GenerationRun.STAGE_CHOICES)[stage])
+        run_stage(run)
+
+    return f"Created post: {run.post.title}"
 
-        return f"Created post: {new_post.title}"
+
+@shared_task(bind=True)
+def generate_daily_blog_post(self, seed=None):
+    logger.info("Starting daily blog post generation")
+
+    run = None
+    try:
+        run = plan_generation_run(self.request.id, seed)
+        if run is None:
+            return
+
+        return run_generation_stages(run)
 
     except Exception as e:
         logger.exception("Failed to generate blog post: %s", str(e))
+        if run is not None:
+            GenerationRun.objects.filter(pk=run.pk).update(last_error=str(e))
         raise self.retry(exc=e, countdown=60)
 
     finally:
-        logger.debug("Resetting generator config to body_generation_config")
-        generator.generation_config = body_generation_config
         logger.debug("Daily blog post generation task completed")
+
+
+@shared_task(bind=True)
+def generate_blog_post(self, affiliate_id, keyword_id, seed=None):
+    """
+    Generate and publish a single post for an already planned pair. Used as
+    the header of the ``generate_blog_post_batch`` chord.
+    """
+    logger.info("Starting blog post generation for affiliate %d, keyword %d",
+                affiliate_id, keyword_id)
+
+    run = None
+    try:
+        affiliate = Affiliate.objects.get(id=affiliate_id)
+        keyword = affiliate.keywords.get(id=keyword_id)
+        run = plan_generation_run(
+            self.request.id, seed, pair=(affiliate, keyword))
+
+        return run_generation_stages(run)
+
+    except Exception as e:
+        logger.exception("Failed to generate blog post: %s", str(e))
+        if run is not None:
+            GenerationRun.objects.filter(pk=run.pk).update(last_error=str(e))
+        if self.request.retries >= self.max_retries:
+            # Give up on this post without failing the chord, so the
+            # callback still reports on the rest of the batch.
+            logger.error("Giving up on affiliate %d, keyword %d",
+                         affiliate_id, keyword_id)
+            return None
+        raise self.retry(exc=e, countdown=60)
+
+
+@shared_task
+def record_generation_batch(results):
+    """Chord callback: report on the batch once every post has finished."""
+    created = [result for result in results if result]
+    logger.info("Generation batch finished: %d of %d posts created",
+                len(created), len(results))
+    return created
+
+
+@shared_task
+def generate_blog_post_batch(count=None):
+    """
+    Claim the next ``count`` pairs of the rotation and generate them as
+    independent subtasks spread across the generation workers.
+    """
+    count = count or settings.AUTO_BLOG_POSTS_PER_BATCH
+    logger.info("Planning batch of %d blog posts", count)
+
+    pairs = claim_next_pairs(count)
+    if not pairs:
+        return
+
+    header = [generate_blog_post.s(affiliate.id, keyword.id)
+              for affiliate, keyword in pairs]
+    chord(header)(record_generation_batch.s())
+    logger.info("Dispatched %d blog post subtasks", len(header))
@@ -8,7 +8,7 @@ from wagtail.documents import urls as wagtaildocs_urls
 
 from search import views as search_views
 
-from views import affiliate_views
+from .views import affiliate_views
 
 urlpatterns = [
     path("django-admin/", admin.site.urls),
@@ -16,7 +16,11 @@ urlpatterns = [
     path('affiliate/', include('affiliate.urls')),
     path("documents/", include(wagtaildocs_urls)),
     path("search/", search_views.search, name="search"),
+    path('click/export/', affiliate_views.export_affiliate_clicks,
+         name='affiliate_click_export'),
     path('click/', affiliate_views.track_affiliate_click, name='affiliate_click'),
+    path('click/<str:token>/', affiliate_views.track_signed_click,
+         name='affiliate_signed_click'),
 
 ]
 
@@ -0,0 +1,180 @@
+# autoblog/utils/affiliate_linker.py
+import html
+import logging
+import re
+
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+
+from .aho_corasick import Automaton
+from .click_tokens import make_click_token
+
+logger = logging.getLogger(__name__)
+
+VERSION_CACHE_KEY = "autoblog:affiliate-linker:version"
+
+# Splits HTML into tags and the text between them.
+TAG_RE = re.compile(r'(<[^>]*>)')
+ANCHOR_OPEN_RE = re.compile(r'<a[\s>]', re.IGNORECASE)
+ANCHOR_CLOSE_RE = re.compile(r'</a\s*>', re.IGNORECASE)
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
+
+
+class AffiliateLinker:
+    """
+    Links every affiliate keyword in a post in one pass over its text.
+
+    Keywords are matched case-insensitively on word boundaries, only the
+    first occurrence of each keyword is linked, text inside HTML tags or
+    existing links is never touched, and where keywords overlap the
+    leftmost, then longest, one wins.
+    """
+
+    def __init__(self, keywords):
+        """
+        ``keywords`` is an iterable of ``(keyword, affiliate_id,
+        keyword_id)``. A ``None`` affiliate marks the keyword with the plain
+        "[Affiliate Link]" suffix instead of wrapping it in a link.
+        """
+        self.automaton = Automaton()
+        self.targets = {}
+        for keyword, affiliate_id, keyword_id in keywords:
+            key = keyword.strip().lower()
+            if key and key not in self.targets:
+                self.targets[key] = (affiliate_id, keyword_id)
+                self.automaton.add(key)
+        self.automaton.build()
+
+    def __len__(self):
+        return len(self.automaton)
+
+    def link(self, content, post_id=None):
+        """
+        Link the keywords in ``content``. Links carry ``post_id`` so clicks
+        can be attributed to the post they came from.
+        """
+        if not content or not len(self):
+            return content
+
+        linked = set()
+        in_anchor = False
+        parts = []
+        for part in TAG_RE.split(content):
+            if part.startswith('<'):
+                if ANCHOR_OPEN_RE.match(part):
+                    in_anchor = True
+                elif ANCHOR_CLOSE_RE.match(part):
+                    in_anchor = False
+                parts.append(part)
+            elif in_anchor:
+                parts.append(part)
+            else:
+                parts.append(self._link_text(part, linked, post_id))
+        return ''.join(parts)
+
+    def _link_text(self, text, linked, post_id):
+        # Lower-casing can change the length of some non-ASCII text, in
+        # which case offsets would not line up, so match it as-is.
+        haystack = text.lower()
+        if len(haystack) != len(text):
+            haystack = text
+
+        matches = sorted(self.automaton.iter(haystack),
+                         key=lambda match: (match[0], -match[1]))
+
+        parts = []
+        position = 0
+        for start, end, key in matches:
+            if start < position or key in linked:
+                continue
+            if start > 0 and _is_word_char(text[start - 1]):
+                continue
+            if end < len(text) and _is_word_char(text[end]):
+                continue
+
+            linked.add(key)
+            parts.append(text[position:start])
+            parts.append(self._replacement(
+                text[start:end], post_id, *self.targets[key]))
+            position = end
+
+        parts.append(text[position:])
+        return ''.join(parts)
+
+    def _replacement(self, matched, post_id, affiliate_id, keyword_id):
+        if affiliate_id is None:
+            return f"{matched} [Affiliate Link]"
+        href = affiliate_click_url(affiliate_id, post_id, keyword_id)
+        return (
+            f'<a href="{html.escape(href)}" rel="sponsored nofollow">'
+            f'{matched}</a>'
+        )
+
+
+def strip_affiliate_links(content):
+    """
+    Undo ``AffiliateLinker.link``: unwrap links to the click tracker, both
+    signed and the older query-string form, and drop "[Affiliate Link]"
+    suffixes, so a post can be linked afresh.
+    """
+    if not content:
+        return content
+    click_link_re = re.compile(
+        r'<a\b[^>]*\bhref="' + re.escape(reverse('affiliate_click'))
+        + r'[^"]*"[^>]*>(.*?)</a\s*>',
+        re.IGNORECASE | re.DOTALL,
+    )
+    content = click_link_re.sub(r'\1', content)
+    return content.replace(" [Affiliate Link]", "")
+
+
+def affiliate_click_url(affiliate_id, post_id=None, keyword_id=None):
+    token = make_click_token(affiliate_id, post_id, keyword_id)
+    return reverse('affiliate_signed_click', args=[token])
+
+
+def build_affiliate_linker():
+    from ..models.affiliate_models import Keyword
+
+    keywords = list(
+        Keyword.objects.order_by('id')
+        .values_list('keyword', 'affiliate_id', 'id')
+    )
+    keywords += [
+        (keyword, None, None) for keyword in settings.AFFILIATE_KEYWORDS
+    ]
+    logger.debug("Building affiliate linker from %d keywords", len(keywords))
+    return AffiliateLinker(keywords)
+
+
+_linker = None
+_linker_version = None
+
+
+def get_affiliate_linker():
+    """
+    Return this process's compiled linker, rebuilding it only when the
+    shared version has been bumped by a keyword change.
+    """
+    global _linker, _linker_version
+
+    version = cache.get(VERSION_CACHE_KEY, 0)
+    if _linker is None or version != _linker_version:
+        _linker = build_affiliate_linker()
+        _linker_version = version
+    return _linker
+
+
+def invalidate_affiliate_linker():
+    global _linker
+
+    logger.debug("Invalidating affiliate linker")
+    _linker = None
+    try:
+        cache.incr(VERSION_CACHE_KEY)
+    except ValueError:
+        cache.set(VERSION_CACHE_KEY, 1, timeout=None)
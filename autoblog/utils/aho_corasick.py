@@ -0,0 +1,77 @@
+# autoblog/utils/aho_corasick.py
+from collections import deque
+
+
+class Automaton:
+    """
+    Aho-Corasick multi-pattern matcher. Patterns are added with ``add``,
+    compiled once with ``build`` and then every occurrence of every
+    pattern in a text is found in a single pass with ``iter``.
+    """
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        self._count = 0
+        self._built = False
+
+    def __len__(self):
+        return self._count
+
+    def add(self, pattern, value=None):
+        if self._built:
+            raise RuntimeError("Cannot add patterns to a built automaton")
+        if not pattern:
+            return
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(
+            (len(pattern), pattern if value is None else value))
+        self._count += 1
+
+    def build(self):
+        if self._built:
+            return self
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] = (
+                    self._output[next_state]
+                    + self._output[self._fail[next_state]]
+                )
+        self._built = True
+        return self
+
+    def iter(self, text):
+        """Yield ``(start, end, value)`` for every match in ``text``."""
+        if not self._built:
+            self.build()
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for end, char in enumerate(text, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, value in output[state]:
+                yield end - length, end, value
+
+    def search(self, text):
+        """Return the value of the first pattern found in ``text``."""
+        for _, _, value in self.iter(text):
+            return value
+        return None
@@ -0,0 +1,30 @@
+# autoblog/utils/blog_cache.py
+import logging
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+VERSION_CACHE_KEY = "autoblog:blog-listings:version"
+
+
+def blog_listings_version():
+    """
+    Version of every cached blog listing; cache keys include it so a bump
+    makes all of them stale at once.
+    """
+    return cache.get(VERSION_CACHE_KEY, 0)
+
+
+def blog_listing_cache_key(*parts):
+    return ":".join(
+        ["autoblog:blog-listing", str(blog_listings_version()),
+         *map(str, parts)])
+
+
+def invalidate_blog_listings():
+    logger.debug("Invalidating cached blog listings")
+    try:
+        cache.incr(VERSION_CACHE_KEY)
+    except ValueError:
+        cache.set(VERSION_CACHE_KEY, 1, timeout=None)
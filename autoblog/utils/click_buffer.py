@@ -0,0 +1,73 @@
+# autoblog/utils/click_buffer.py
+import json
+import logging
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+BUFFER_KEY = "autoblog:affiliate-clicks"
+PROCESSING_KEY = "autoblog:affiliate-clicks:processing"
+FLUSH_LOCK_KEY = "autoblog:affiliate-clicks:flush-lock"
+
+_client = None
+
+
+def get_client():
+    global _client
+
+    if _client is None:
+        import redis
+
+        _client = redis.Redis.from_url(
+            settings.AFFILIATE_CLICK_BUFFER_URL,
+            socket_timeout=settings.AFFILIATE_CLICK_BUFFER_TIMEOUT,
+            socket_connect_timeout=settings.AFFILIATE_CLICK_BUFFER_TIMEOUT,
+        )
+    return _client
+
+
+def buffer_click(click):
+    """Append a click (a JSON-serialisable dict) to the shared buffer."""
+    get_client().rpush(BUFFER_KEY, json.dumps(click))
+
+
+def drain_clicks(batch_size):
+    """
+    Claim up to ``batch_size`` of the oldest buffered clicks by moving them
+    to the processing list, and return them. Claimed clicks stay there
+    until ``ack_clicks`` is called, so a worker dying mid-flush loses
+    nothing: if the processing list is not empty, its clicks are returned
+    again instead of claiming new ones.
+
+    Callers must hold ``flush_lock``.
+    """
+    client = get_client()
+    raw_clicks = client.lrange(PROCESSING_KEY, 0, -1)
+    if raw_clicks:
+        logger.warning("Retrying %d unacknowledged clicks", len(raw_clicks))
+    else:
+        count = min(batch_size, client.llen(BUFFER_KEY))
+        with client.pipeline(transaction=False) as pipe:
+            for _ in range(count):
+                pipe.lmove(BUFFER_KEY, PROCESSING_KEY, 'LEFT', 'RIGHT')
+            raw_clicks = [raw for raw in pipe.execute() if raw is not None]
+    return [json.loads(raw) for raw in raw_clicks]
+
+
+def ack_clicks():
+    """Forget the claimed clicks once they have been committed."""
+    get_client().delete(PROCESSING_KEY)
+
+
+def flush_lock():
+    """
+    Lock held while flushing, so concurrent flushes do not share the
+    processing list. Expires in case the holder dies.
+    """
+    return get_client().lock(
+        FLUSH_LOCK_KEY, timeout=settings.AFFILIATE_CLICK_FLUSH_LOCK_TIMEOUT)
+
+
+def buffered_click_count():
+    return get_client().llen(BUFFER_KEY)
@@ -0,0 +1,95 @@
+# autoblog/utils/click_export.py
+import csv
+import json
+from datetime import datetime, time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from ..models.affiliate_models import AffiliateClick
+from .click_retention import ARCHIVE_FIELDS
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def parse_export_time(value):
+    """
+    Parse an ISO date or datetime bounding a click export. Dates
+    mean local midnight; naive datetimes are in the current timezone.
+    """
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        parsed_date = parse_date(value)
+        if parsed_date is None:
+            raise ValueError(f"Invalid date: {value}")
+        parsed = datetime.combine(parsed_date, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def iter_clicks(start=None, end=None, batch_size=5000):
+    """
+    Yield clicks with ``start <= click_time < end`` as dicts keyed by the
+    archive columns, in ``(click_time, id)`` order.
+
+    Pages are fetched by seeking past the last row of the previous page
+    rather than with OFFSET, so every page costs the same index range scan
+    however deep into the table it is.
+    """
+    clicks = AffiliateClick.objects.order_by('click_time', 'id')
+    if start is not None:
+        clicks = clicks.filter(click_time__gte=start)
+    if end is not None:
+        clicks = clicks.filter(click_time__lt=end)
+    clicks = clicks.values(*ARCHIVE_FIELDS.values())
+
+    page = clicks
+    while True:
+        rows = list(page[:batch_size])
+        for row in rows:
+            yield {
+                column: row[field]
+                for column, field in ARCHIVE_FIELDS.items()
+            }
+        if len(rows) < batch_size:
+            return
+        last = rows[-1]
+        page = clicks.filter(
+            Q(click_time__gt=last['click_time'])
+            | Q(click_time=last['click_time'], id__gt=last['id'])
+        )
+
+
+class _Echo:
+    """File-like object whose ``write`` returns what it was given."""
+
+    def write(self, value):
+        return value
+
+
+def render_csv(rows):
+    writer = csv.DictWriter(_Echo(), fieldnames=ARCHIVE_FIELDS)
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def render_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+
+def render_clicks(rows, export_format):
+    if export_format == 'csv':
+        return render_csv(rows)
+    if export_format == 'ndjson':
+        return render_ndjson(rows)
+    raise ValueError(f"Unknown export format: {export_format}")
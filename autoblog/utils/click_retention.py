@@ -0,0 +1,87 @@
+# autoblog/utils/click_retention.py
+import csv
+import gzip
+import logging
+import os
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from ..models.affiliate_models import AffiliateClick
+
+logger = logging.getLogger(__name__)
+
+# Archive column -> click field it is read from.
+ARCHIVE_FIELDS = {
+    'id': 'id',
+    'click_time': 'click_time',
+    'affiliate_id': 'affiliate_id',
+    'affiliate_product': 'affiliate_product',
+    'post_id': 'post_id',
+    'ip_address': 'ip_address',
+    'user_agent': 'user_agent__text',
+    'is_bot': 'user_agent__is_bot',
+    'revenue': 'revenue',
+}
+
+
+def archive_path(archive_dir, month):
+    return os.path.join(archive_dir, f"affiliate-clicks-{month}.csv.gz")
+
+
+def write_archive(archive_dir, rows):
+    """
+    Append ``rows`` to one gzipped CSV per calendar month. Each call adds
+    a new gzip member, which gzip readers concatenate transparently.
+    """
+    by_month = defaultdict(list)
+    for row in rows:
+        by_month[timezone.localtime(row['click_time']).strftime('%Y-%m')].append(row)
+
+    os.makedirs(archive_dir, exist_ok=True)
+    for month, month_rows in by_month.items():
+        path = archive_path(archive_dir, month)
+        is_new = not os.path.exists(path)
+        with gzip.open(path, 'at', newline='') as archive:
+            writer = csv.DictWriter(archive, fieldnames=ARCHIVE_FIELDS)
+            if is_new:
+                writer.writeheader()
+            for row in month_rows:
+                writer.writerow({
+                    column: row[field]
+                    for column, field in ARCHIVE_FIELDS.items()
+                } | {'click_time': row['click_time'].isoformat()})
+    return sorted(by_month)
+
+
+def archive_clicks(before, archive_dir, batch_size):
+    """
+    Move every click older than ``before`` into the monthly archive files,
+    oldest first, deleting each batch once it has been written.
+
+    Clicks are added to the hourly and daily rollups as they are flushed,
+    so reports keep covering archived clicks. A crash between writing a
+    batch and deleting it means that batch is archived twice on the next
+    run, never lost.
+    """
+    archived = 0
+    old_clicks = AffiliateClick.objects.filter(
+        click_time__lt=before).order_by('click_time', 'id')
+
+    while True:
+        rows = list(
+            old_clicks.values(*ARCHIVE_FIELDS.values())[:batch_size])
+        if not rows:
+            break
+
+        months = write_archive(archive_dir, rows)
+        with transaction.atomic():
+            AffiliateClick.objects.filter(
+                id__in=[row['id'] for row in rows]).delete()
+
+        archived += len(rows)
+        logger.debug("Archived %d clicks into %s", len(rows), months)
+
+    logger.info("Archived %d clicks older than %s", archived, before)
+    return archived
@@ -0,0 +1,137 @@
+# autoblog/utils/click_rollups.py
+import logging
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate, TruncHour
+from django.utils import timezone
+
+from ..models.affiliate_models import (
+    AffiliateClick,
+    AffiliateClickDaily,
+    AffiliateClickHourly,
+)
+
+logger = logging.getLogger(__name__)
+
+ROLLUPS = (
+    (AffiliateClickHourly, 'hour'),
+    (AffiliateClickDaily, 'day'),
+)
+
+
+def _bucket(click_time, time_field):
+    if time_field == 'hour':
+        return click_time.replace(minute=0, second=0, microsecond=0)
+    return timezone.localtime(click_time).date()
+
+
+def rollup_clicks(clicks):
+    """
+    Add a batch of newly saved clicks to the hourly and daily rollups,
+    with one update (or insert) per distinct bucket rather than per click.
+    """
+    with transaction.atomic():
+        for model, time_field in ROLLUPS:
+            totals = defaultdict(lambda: [0, Decimal(0)])
+            for click in clicks:
+                key = (
+                    _bucket(click.click_time, time_field),
+                    click.affiliate_id,
+                    click.affiliate_product,
+                    click.post_id,
+                )
+                totals[key][0] += 1
+                totals[key][1] += click.revenue or 0
+
+            for (bucket, affiliate_id, product, post_id), (count, revenue) \
+                    in totals.items():
+                lookup = {
+                    time_field: bucket,
+                    'affiliate_id': affiliate_id,
+                    'affiliate_product': product,
+                    'post_id': post_id,
+                }
+                increment = {
+                    'clicks': F('clicks') + count,
+                    'revenue': F('revenue') + revenue,
+                }
+                if model.objects.filter(**lookup).update(**increment):
+                    continue
+                try:
+                    with transaction.atomic():
+                        model.objects.create(
+                            clicks=count, revenue=revenue, **lookup)
+                except IntegrityError:
+                    # Another writer created the bucket since the update.
+                    model.objects.filter(**lookup).update(**increment)
+
+            logger.debug("Updated %d %s rollup rows",
+                         len(totals), time_field)
+
+
+def rebuild_rollups(since):
+    """
+    Recompute every rollup bucket from the day of ``since`` onwards from the raw
+    click table. Buckets before ``since`` are left alone, so rollups for
+    clicks that have already been archived are kept; ``since`` is moved
+    forward so no day whose raw clicks were archived is rebuilt.
+
+    Returns the start of the rebuilt range, or ``None`` if nothing was
+    rebuilt.
+    """
+    # Start from a day boundary so no daily bucket is partially recounted.
+    since = timezone.localtime(since).replace(
+        hour=0, minute=0, second=0, microsecond=0)
+
+    # Rollups must never be recounted from a raw table that no longer
+    # holds their clicks. If there are rollups older than the oldest
+    # remaining click, clicks have been archived and that click's own day
+    # may be partly archived, so only the days after it are rebuilt.
+    oldest = (
+        AffiliateClick.objects.order_by('click_time')
+        .values_list('click_time', flat=True).first()
+    )
+    if oldest is None:
+        logger.info("No raw clicks left; keeping all rollups")
+        return None
+    earliest = timezone.localtime(oldest).replace(
+        hour=0, minute=0, second=0, microsecond=0)
+    if AffiliateClickDaily.objects.filter(day__lt=earliest.date()).exists():
+        earliest += timedelta(days=1)
+    if since < earliest:
+        logger.warning(
+            "Not rebuilding rollups before %s: older raw clicks may have "
+            "been archived", earliest)
+        since = earliest
+
+    clicks = AffiliateClick.objects.filter(click_time__gte=since)
+    with transaction.atomic():
+        for model, time_field in ROLLUPS:
+            trunc = TruncHour if time_field == 'hour' else TruncDate
+            bucket_since = _bucket(since, time_field)
+            model.objects.filter(**{f'{time_field}__gte': bucket_since}).delete()
+
+            rows = (
+                clicks.annotate(bucket=trunc('click_time'))
+                .values('bucket', 'affiliate_id', 'affiliate_product', 'post_id')
+                .annotate(total_clicks=Count('id'), total_revenue=Sum('revenue'))
+                .order_by()
+            )
+            model.objects.bulk_create([
+                model(
+                    clicks=row['total_clicks'],
+                    revenue=row['total_revenue'] or 0,
+                    affiliate_id=row['affiliate_id'],
+                    affiliate_product=row['affiliate_product'],
+                    post_id=row['post_id'],
+                    **{time_field: row['bucket']},
+                )
+                for row in rows
+            ], batch_size=1000)
+            logger.info("Rebuilt %s rollups since %s",
+                        time_field, bucket_since)
+    return since
@@ -0,0 +1,66 @@
+# autoblog/utils/click_tokens.py
+import base64
+
+from django.conf import settings
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+SALT = "autoblog.utils.click_tokens"
+SIGNATURE_BYTES = 8
+
+
+class BadClickToken(ValueError):
+    pass
+
+
+def _signature(value, secret=None):
+    digest = salted_hmac(
+        SALT, value, secret=secret, algorithm='sha256').digest()
+    return base64.urlsafe_b64encode(
+        digest[:SIGNATURE_BYTES]).rstrip(b'=').decode('ascii')
+
+
+def _to_base36(number):
+    digits = "0123456789abcdefghijklmnopqrstuvwxyz"
+    encoded = ""
+    while True:
+        number, remainder = divmod(number, 36)
+        encoded = digits[remainder] + encoded
+        if not number:
+            return encoded
+
+
+def make_click_token(affiliate_id, post_id=None, keyword_id=None):
+    """
+    Compact signed token for a click on an affiliate link, carrying the
+    affiliate, the post it appeared in and the keyword that was linked.
+    Missing ids are encoded as 0.
+    """
+    value = ".".join(
+        _to_base36(number or 0)
+        for number in (affiliate_id, post_id, keyword_id)
+    )
+    return f"{value}.{_signature(value)}"
+
+
+def read_click_token(token):
+    """
+    Return the ``(affiliate_id, post_id, keyword_id)`` carried by
+    ``token``, with ``None`` for missing ids. Raises ``BadClickToken`` if
+    the token is malformed or its signature does not match.
+    """
+    value, _, signature = token.rpartition('.')
+    # Links are baked into published posts, so tokens signed with a key
+    # rotated into SECRET_KEY_FALLBACKS must keep working.
+    if not value or not any(
+        constant_time_compare(signature, _signature(value, secret))
+        for secret in [settings.SECRET_KEY, *settings.SECRET_KEY_FALLBACKS]
+    ):
+        raise BadClickToken("Bad click token signature")
+
+    try:
+        affiliate_id, post_id, keyword_id = (
+            int(part, 36) for part in value.split('.'))
+    except ValueError:
+        raise BadClickToken("Malformed click token")
+
+    return affiliate_id, post_id or None, keyword_id or None
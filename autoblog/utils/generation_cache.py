@@ -0,0 +1,42 @@
+# autoblog/utils/generation_cache.py
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+
+def _cache():
+    return caches[settings.AUTO_BLOG_GENERATION_CACHE]
+
+
+def generation_cache_key(model_name, config, prompt_text, seed, **params):
+    """
+    Key for one generated text, derived from everything that determines
+    the output: the model, the full generation config, the rendered
+    prompt, the seed and any extra generation parameters.
+    """
+    payload = json.dumps({
+        'model': model_name,
+        'config': config.to_dict(),
+        'prompt': prompt_text,
+        'seed': seed,
+        'params': params,
+    }, sort_keys=True, default=str)
+    digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    return f"autoblog:generation:{digest}"
+
+
+def get_cached_generations(keys):
+    cached = _cache().get_many(keys)
+    logger.debug("Generation cache hits: %d/%d", len(cached), len(keys))
+    return cached
+
+
+def cache_generations(generations):
+    if generations:
+        logger.debug("Caching %d generated texts", len(generations))
+        _cache().set_many(generations)
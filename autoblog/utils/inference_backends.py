@@ -0,0 +1,87 @@
+# autoblog/utils/inference_backends.py
+import logging
+import os
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+logger = logging.getLogger(__name__)
+
+
+def load_pytorch_model(model_name):
+    from transformers import AutoModelForCausalLM
+
+    logger.debug("Loading fp32 PyTorch model: %s", model_name)
+    model = AutoModelForCausalLM.from_pretrained(model_name)
+    model.eval()
+    return model
+
+
+def load_quantized_model(model_name):
+    import torch
+
+    model = load_pytorch_model(model_name)
+    # GPT-2 style models implement their projections with transformers'
+    # Conv1D, which dynamic quantization does not recognise, so swap them
+    # for the equivalent nn.Linear first.
+    _replace_conv1d_with_linear(model)
+
+    logger.debug("Applying dynamic int8 quantization to %s", model_name)
+    return torch.ao.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _replace_conv1d_with_linear(module):
+    import torch
+    from transformers.pytorch_utils import Conv1D
+
+    for name, child in module.named_children():
+        if isinstance(child, Conv1D):
+            in_features, out_features = child.weight.shape
+            linear = torch.nn.Linear(in_features, out_features)
+            linear.weight.data = child.weight.data.t().contiguous()
+            linear.bias.data = child.bias.data
+            setattr(module, name, linear)
+        else:
+            _replace_conv1d_with_linear(child)
+
+
+def load_onnx_model(model_name):
+    try:
+        from optimum.onnxruntime import ORTModelForCausalLM
+    except ImportError as e:
+        raise ImproperlyConfigured(
+            "The 'onnx' inference backend requires optimum[onnxruntime] "
+            "to be installed"
+        ) from e
+
+    # Exporting takes far longer than loading, so the exported model is
+    # kept on disk and reused by every worker process.
+    export_dir = os.path.join(
+        settings.AUTO_BLOG_ONNX_EXPORT_DIR, model_name.replace('/', '--'))
+    if os.path.exists(os.path.join(export_dir, 'model.onnx')):
+        logger.debug("Loading exported ONNX model from %s", export_dir)
+        return ORTModelForCausalLM.from_pretrained(export_dir)
+
+    logger.debug("Exporting %s to ONNX in %s", model_name, export_dir)
+    model = ORTModelForCausalLM.from_pretrained(model_name, export=True)
+    model.save_pretrained(export_dir)
+    return model
+
+
+BACKENDS = {
+    'pytorch': load_pytorch_model,
+    'pytorch-int8': load_quantized_model,
+    'onnx': load_onnx_model,
+}
+
+
+def load_model(model_name, backend):
+    try:
+        loader = BACKENDS[backend]
+    except KeyError:
+        raise ImproperlyConfigured(
+            f"Unknown inference backend {backend!r}; "
+            f"choose one of {', '.join(BACKENDS)}"
+        )
+    return loader(model_name)
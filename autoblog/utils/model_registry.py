@@ -0,0 +1,166 @@
+# autoblog/utils/model_registry.py
+import logging
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ModelRegistry:
+    """
+    Holds the tokenizer, text-generation pipeline and generation configs
+    for a single process.
+
+    Nothing is loaded at import time; the model is loaded the first time
+    one of its attributes is accessed (or when ``load`` is called from a
+    worker start-up signal) and then stays resident until the process
+    exits.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._tokenizer = None
+        self._generator = None
+        self._body_generation_config = None
+        self._title_generation_config = None
+
+    @property
+    def model_name(self):
+        return settings.AUTO_BLOG_MODEL_NAME
+
+    @property
+    def backend(self):
+        return settings.AUTO_BLOG_INFERENCE_BACKEND
+
+    @property
+    def supports_cache_reuse(self):
+        # ONNX Runtime models manage their own past key/values and cannot
+        # be handed a DynamicCache to continue from.
+        return self.backend != 'onnx'
+
+    @property
+    def is_loaded(self):
+        return self._loaded
+
+    @property
+    def tokenizer(self):
+        self.load()
+        return self._tokenizer
+
+    @property
+    def generator(self):
+        self.load()
+        return self._generator
+
+    @property
+    def model(self):
+        return self.generator.model
+
+    @property
+    def body_generation_config(self):
+        self.load()
+        return self._body_generation_config
+
+    @property
+    def title_generation_config(self):
+        self.load()
+        return self._title_generation_config
+
+    def load(self):
+        if self._loaded:
+            return
+
+        with self._lock:
+            if self._loaded:
+                return
+
+            # Imported here so that web workers and management commands
+            # never pay for importing torch/transformers.
+            from transformers import pipeline, AutoTokenizer
+            from transformers.generation import GenerationConfig
+
+            from .inference_backends import load_model
+
+            try:
+                logger.debug("Initializing tokenizer with model: %s",
+                             self.model_name)
+                tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+                if tokenizer.pad_token is None:
+                    logger.debug(
+                        "No pad_token found, setting to eos_token or [PAD]")
+                    tokenizer.pad_token = tokenizer.eos_token or "[PAD]"
+            except Exception as e:
+                logger.error(f"Failed to initialize tokenizer: {str(e)}")
+                raise
+
+            logger.debug("Setting tokenizer padding_side to 'left'")
+            tokenizer.padding_side = "left"
+
+            logger.debug("Loading model with %s inference backend",
+                         self.backend)
+            model = load_model(self.model_name, self.backend)
+
+            logger.debug("Initializing text-generation pipeline")
+            # Prompts are not padded: a single prompt needs no padding, and
+            # padding it would both waste forward passes and hide its real
+            # length from the sentence stopping criteria. Generation options
+            # are passed per call through a GenerationConfig, and stopping
+            # is handled by the sentence stopping criteria.
+            generator = pipeline(
+                'text-generation',
+                model=model,
+                device=-1,
+                tokenizer=tokenizer,
+                truncation=True,
+            )
+            logger.debug("Text-generation pipeline initialized successfully")
+
+            body_generation_config = GenerationConfig(
+                max_new_tokens=400,
+                min_new_tokens=50,
+                do_sample=True,
+                temperature=0.7,
+                top_k=50,
+                top_p=0.95,
+                num_beams=3,
+                early_stopping=True,
+                eos_token_id=tokenizer.eos_token_id,
+                pad_token_id=tokenizer.eos_token_id
+            )
+            logger.debug("Body generation config created: %s",
+                         body_generation_config)
+
+            title_generation_config = GenerationConfig(
+                max_new_tokens=15,
+                min_new_tokens=5,
+                do_sample=True,
+                temperature=0.7,
+                top_k=20,
+                top_p=0.85,
+                num_beams=3,
+                no_repeat_ngram_size=2,
+                early_stopping=True,
+                eos_token_id=tokenizer.eos_token_id,
+                pad_token_id=tokenizer.eos_token_id,
+                length_penalty=1.5,
+                repetition_penalty=1.2
+            )
+            logger.debug("Title generation config created: %s",
+                         title_generation_config)
+
+            self._tokenizer = tokenizer
+            self._generator = generator
+            self._body_generation_config = body_generation_config
+            self._title_generation_config = title_generation_config
+            self._loaded = True
+
+    def set_seed(self, seed):
+        from transformers import set_seed
+
+        logger.debug("Setting generation seed: %d", seed)
+        set_seed(seed)
+
+
+registry = ModelRegistry()
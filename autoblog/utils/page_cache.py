@@ -0,0 +1,107 @@
+# autoblog/utils/page_cache.py
+import hashlib
+import logging
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+def page_version_key(page_id):
+    return f"autoblog:page-cache:version:{page_id}"
+
+
+def page_cache_key(page, request):
+    """
+    Cache key for the rendered response of ``page`` at the host and path
+    of ``request``. Only the query parameters the page reads
+    (``cache_query_params``) are part of the key, so junk parameters
+    share the entry of the clean URL instead of each adding one. The
+    page's version is part of the key, so purging a page drops every URL
+    variant of it.
+    """
+    version = cache.get(page_version_key(page.pk), 0)
+    params = urlencode([
+        (name, request.GET[name])
+        for name in sorted(page.cache_query_params)
+        if name in request.GET
+    ])
+    url = hashlib.md5(
+        f"{request.get_host()}{request.path}?{params}".encode()
+    ).hexdigest()
+    return f"autoblog:page-cache:{page.pk}:{version}:{url}"
+
+
+def is_cacheable_request(request):
+    """
+    Only anonymous, non-preview reads without a per-user timezone are
+    served from or stored in the page cache.
+    """
+    return (
+        request.method in ('GET', 'HEAD')
+        and not getattr(request, 'is_preview', False)
+        and not request.user.is_authenticated
+        and not request.session.get('django_timezone')
+    )
+
+
+def is_cacheable_response(request, response):
+    return (
+        response.status_code == 200
+        and not response.cookies
+        and not response.has_header('Set-Cookie')
+        # The page embeds a CSRF token, which is specific to this visitor.
+        and not request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+        and 'private' not in response.get('Cache-Control', '')
+        and 'no-store' not in response.get('Cache-Control', '')
+    )
+
+
+def purge_pages(page_ids):
+    """Drop every cached response of the given pages."""
+    page_ids = list(page_ids)
+    logger.debug("Purging page cache for pages %s", page_ids)
+    for page_id in page_ids:
+        try:
+            cache.incr(page_version_key(page_id))
+        except ValueError:
+            cache.set(page_version_key(page_id), 1, timeout=None)
+
+
+class FullPageCacheMixin:
+    """
+    Serve anonymous requests for a page from a cached copy of its rendered
+    response. Entries live for FULL_PAGE_CACHE_TIMEOUT seconds or until the
+    page is purged, which happens when it or a post it lists is published
+    or unpublished.
+    """
+
+    # Query parameters that change what the page renders.
+    cache_query_params = ()
+
+    def serve(self, request, *args, **kwargs):
+        timeout = settings.FULL_PAGE_CACHE_TIMEOUT
+        if not timeout or not is_cacheable_request(request):
+            return super().serve(request, *args, **kwargs)
+
+        cache_key = page_cache_key(self, request)
+        response = cache.get(cache_key)
+        if response is not None:
+            logger.debug("Page cache hit for %s", request.path)
+            return response
+
+        response = super().serve(request, *args, **kwargs)
+        if request.method != 'GET':
+            return response
+
+        def store(response):
+            if is_cacheable_response(request, response):
+                cache.set(cache_key, response, timeout=timeout)
+
+        if hasattr(response, 'render') and callable(response.render):
+            response.add_post_render_callback(store)
+        else:
+            store(response)
+        return response
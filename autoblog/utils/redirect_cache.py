@@ -0,0 +1,88 @@
+# autoblog/utils/redirect_cache.py
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = "autoblog:affiliate-link:{}"
+
+_local = OrderedDict()
+_local_lock = threading.Lock()
+
+
+def _get_local(affiliate_id):
+    with _local_lock:
+        entry = _local.get(affiliate_id)
+        if entry is None:
+            return None
+        link, expires = entry
+        if expires < time.monotonic():
+            del _local[affiliate_id]
+            return None
+        _local.move_to_end(affiliate_id)
+        return link
+
+
+def _set_local(affiliate_id, link):
+    with _local_lock:
+        _local[affiliate_id] = (
+            link, time.monotonic() + settings.AFFILIATE_LINK_LOCAL_TTL)
+        _local.move_to_end(affiliate_id)
+        while len(_local) > settings.AFFILIATE_LINK_LOCAL_CACHE_SIZE:
+            _local.popitem(last=False)
+
+
+def get_affiliate_link(affiliate_id):
+    """
+    Return the redirect target for ``affiliate_id``, or ``None`` if the
+    affiliate does not exist or has no link.
+
+    Lookups go through a small per-process LRU, then the shared cache,
+    and only reach the database on a miss in both.
+    """
+    link = _get_local(affiliate_id)
+    if link is not None:
+        return link or None
+
+    key = CACHE_KEY.format(affiliate_id)
+    # An unavailable shared cache must not break redirects, so any error
+    # from it is treated as a miss.
+    try:
+        link = cache.get(key)
+    except Exception:
+        logger.warning("Affiliate link cache read failed", exc_info=True)
+        link = None
+    if link is None:
+        from ..models.affiliate_models import Affiliate
+
+        links = list(
+            Affiliate.objects.filter(id=affiliate_id)
+            .values_list('affiliate_link', flat=True)[:1]
+        )
+        if not links:
+            return None
+        # Affiliates without a link are cached as "" so they are not
+        # looked up again on every click.
+        link = links[0] or ""
+        try:
+            cache.set(key, link, timeout=None)
+        except Exception:
+            logger.warning("Affiliate link cache write failed", exc_info=True)
+
+    _set_local(affiliate_id, link)
+    return link or None
+
+
+def invalidate_affiliate_link(affiliate_id):
+    """
+    Forget the cached link for ``affiliate_id``. Other processes drop
+    their local copy within ``AFFILIATE_LINK_LOCAL_TTL`` seconds.
+    """
+    cache.delete(CACHE_KEY.format(affiliate_id))
+    with _local_lock:
+        _local.pop(affiliate_id, None)
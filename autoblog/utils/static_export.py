@@ -0,0 +1,152 @@
+# autoblog/utils/static_export.py
+import json
+import logging
+import os
+import tempfile
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import Client
+
+from ..models.blog_models import BlogIndexPage, BlogPage
+from ..models.home_models import HomePage
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+LOCK_CACHE_KEY = "autoblog:static-export:lock"
+
+# Page types rendered to static files, in the order they are exported.
+# Blog index and home pages list posts, so they are re-rendered whenever a
+# post is; other pages only when they are published themselves.
+EXPORTED_PAGE_TYPES = (BlogPage, BlogIndexPage, HomePage)
+LISTING_PAGE_TYPES = (BlogIndexPage, HomePage)
+
+
+@contextmanager
+def export_lock():
+    """
+    Yield whether this process got the export lock. Exports share the
+    manifest and output files, so only one may run at a time.
+    """
+    acquired = cache.add(
+        LOCK_CACHE_KEY, 1, timeout=settings.STATIC_EXPORT_LOCK_TIMEOUT)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            cache.delete(LOCK_CACHE_KEY)
+
+
+def export_path(export_dir, page_path):
+    """File a page is written to, e.g. ``/blog/my-post/index.html``."""
+    return os.path.join(export_dir, page_path.strip('/'), "index.html")
+
+
+def read_manifest(export_dir):
+    try:
+        with open(os.path.join(export_dir, MANIFEST_NAME)) as manifest:
+            return json.load(manifest)
+    except FileNotFoundError:
+        return {}
+
+
+def write_file(path, content):
+    """Write ``content`` to ``path`` atomically, so nginx never serves a
+    half-written file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            tmp.write(content)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def render_page(client, page, page_path):
+    """Render ``page`` as an anonymous visitor would see it."""
+    site = page.get_site()
+    response = client.get(
+        page_path,
+        HTTP_HOST=site.hostname,
+        SERVER_PORT=str(site.port),
+        secure=site.port == 443,
+    )
+    if response.status_code != 200:
+        raise ValueError(
+            f"{page_path} returned status {response.status_code}")
+    return response.content
+
+
+def export_static_pages(export_dir, force=False):
+    """
+    Render live blog posts, blog indexes and home pages into
+    ``export_dir``. Only pages whose ``last_published_at`` changed since
+    the previous export are rendered again (plus listing pages, if any post
+    changed), and files of pages no longer live are removed.
+
+    Returns a ``(rendered, removed)`` tuple of page counts.
+    """
+    manifest = {} if force else read_manifest(export_dir)
+    exported = {}
+    pages = []
+    for page_type in EXPORTED_PAGE_TYPES:
+        for page in page_type.objects.live().defer_streamfields():
+            url_parts = page.get_url_parts()
+            if url_parts is None:
+                continue
+            published = (
+                page.last_published_at.isoformat()
+                if page.last_published_at else None)
+            pages.append((page, url_parts[2], published))
+            exported[str(page.pk)] = {
+                'path': url_parts[2], 'published': published}
+
+    removed = [
+        entry for page_id, entry in manifest.items()
+        if exported.get(page_id, {}).get('path') != entry['path']
+    ]
+    posts_changed = bool(removed) or any(
+        manifest.get(str(page.pk)) != exported[str(page.pk)]
+        for page, _, _ in pages if isinstance(page, BlogPage)
+    )
+
+    client = Client()
+    rendered = 0
+    for page, page_path, published in pages:
+        unchanged = manifest.get(str(page.pk)) == exported[str(page.pk)]
+        is_listing = isinstance(page, LISTING_PAGE_TYPES)
+        if unchanged and not (is_listing and posts_changed):
+            continue
+        try:
+            content = render_page(client, page, page_path)
+        except Exception:
+            logger.exception("Failed to export page %s", page_path)
+            # Keep the previous entry (if any) so the next export retries
+            # the page and can still remove its old file.
+            if str(page.pk) in manifest:
+                exported[str(page.pk)] = manifest[str(page.pk)]
+            else:
+                del exported[str(page.pk)]
+            continue
+        write_file(export_path(export_dir, page_path), content)
+        rendered += 1
+        logger.debug("Exported %s", page_path)
+
+    for entry in removed:
+        try:
+            os.remove(export_path(export_dir, entry['path']))
+        except FileNotFoundError:
+            pass
+
+    write_file(
+        os.path.join(export_dir, MANIFEST_NAME),
+        json.dumps(exported, indent=2).encode(),
+    )
+    logger.info(
+        "Static export: rendered %d pages, removed %d", rendered, len(removed))
+    return rendered, len(removed)
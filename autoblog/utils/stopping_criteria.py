@@ -0,0 +1,53 @@
+# autoblog/utils/stopping_criteria.py
+import logging
+
+import torch
+from transformers import StoppingCriteria, StoppingCriteriaList
+
+logger = logging.getLogger(__name__)
+
+SENTENCE_ENDINGS = ('.', '?', '!')
+
+_boundary_token_ids = {}
+
+
+def sentence_boundary_token_ids(tokenizer):
+    """
+    Ids of every vocabulary token whose text ends a sentence. Computed
+    once per tokenizer so the per-step check is a tensor lookup rather
+    than a decode.
+    """
+    key = tokenizer.name_or_path
+    if key not in _boundary_token_ids:
+        logger.debug("Building sentence boundary token ids for %s", key)
+        ids = [
+            token_id for token_id in range(len(tokenizer))
+            if tokenizer.decode([token_id]).rstrip().endswith(SENTENCE_ENDINGS)
+        ]
+        _boundary_token_ids[key] = torch.tensor(ids, dtype=torch.long)
+    return _boundary_token_ids[key]
+
+
+class SentenceBoundaryCriteria(StoppingCriteria):
+    """
+    Stops a sequence as soon as it emits a sentence-ending token, once at
+    least ``min_new_tokens`` tokens have been generated after the prompt.
+    """
+
+    def __init__(self, tokenizer, prompt_length, min_new_tokens=0):
+        self.boundary_token_ids = sentence_boundary_token_ids(tokenizer)
+        self.prompt_length = prompt_length
+        self.min_new_tokens = min_new_tokens or 0
+
+    def __call__(self, input_ids, scores, **kwargs):
+        if input_ids.shape[-1] - self.prompt_length < self.min_new_tokens:
+            return torch.zeros(
+                input_ids.shape[0], dtype=torch.bool, device=input_ids.device)
+        return torch.isin(
+            input_ids[:, -1], self.boundary_token_ids.to(input_ids.device))
+
+
+def sentence_stopping_criteria(tokenizer, prompt_length, min_new_tokens=0):
+    return StoppingCriteriaList([
+        SentenceBoundaryCriteria(tokenizer, prompt_length, min_new_tokens)
+    ])
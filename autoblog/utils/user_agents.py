@@ -0,0 +1,128 @@
+# autoblog/utils/user_agents.py
+import hashlib
+import ipaddress
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+from django.conf import settings
+
+from .aho_corasick import Automaton
+
+# Lower-case substrings that identify crawlers, link-preview fetchers and
+# HTTP libraries rather than people.
+BOT_TOKENS = (
+    "bot",
+    "crawl",
+    "spider",
+    "slurp",
+    "preview",
+    "facebookexternalhit",
+    "embedly",
+    "headless",
+    "curl",
+    "wget",
+    "python-requests",
+    "httpclient",
+    "go-http-client",
+    "okhttp",
+    "whatsapp",
+    "telegram",
+    "discord",
+    "skypeuripreview",
+    "bitly",
+    "lighthouse",
+)
+
+
+def _build_bot_automaton():
+    automaton = Automaton()
+    for token in (*BOT_TOKENS, *settings.AFFILIATE_EXTRA_BOT_TOKENS):
+        automaton.add(token.lower())
+    return automaton.build()
+
+
+_bot_automaton = _build_bot_automaton()
+
+_ids = OrderedDict()
+_ids_lock = threading.Lock()
+
+
+def user_agent_hash(text):
+    return hashlib.sha1(text.encode('utf-8', 'replace')).hexdigest()
+
+
+@lru_cache(maxsize=settings.USER_AGENT_CACHE_SIZE)
+def is_bot_user_agent(text):
+    """
+    Whether ``text`` looks like a crawler, link previewer or HTTP library.
+    All bot tokens are matched in one pass, and results are memoized
+    per user-agent string.
+    """
+    if not text:
+        return True
+    return _bot_automaton.search(text.lower()) is not None
+
+
+def normalize_ip(value):
+    """
+    Canonical compact form of an IP address, with IPv4-mapped IPv6
+    addresses unpacked, or ``None`` if ``value`` is not an IP address.
+    """
+    try:
+        address = ipaddress.ip_address((value or "").strip())
+    except ValueError:
+        return None
+    if address.version == 6 and address.ipv4_mapped:
+        address = address.ipv4_mapped
+    return address.compressed
+
+
+def _remember(hashes_to_ids):
+    with _ids_lock:
+        for user_agent_hash_, user_agent_id in hashes_to_ids.items():
+            _ids[user_agent_hash_] = user_agent_id
+            _ids.move_to_end(user_agent_hash_)
+        while len(_ids) > settings.USER_AGENT_CACHE_SIZE:
+            _ids.popitem(last=False)
+
+
+def resolve_user_agents(texts):
+    """
+    Map each user-agent string in ``texts`` to its ``UserAgent`` id,
+    creating (and classifying) rows for user agents not seen before.
+    Known ids are served from a per-process LRU, so a batch of clicks
+    costs at most one select and one insert.
+    """
+    from ..models.affiliate_models import UserAgent
+
+    hashes = {text: user_agent_hash(text) for text in set(texts)}
+
+    ids = {}
+    with _ids_lock:
+        for user_agent_hash_ in hashes.values():
+            if user_agent_hash_ in _ids:
+                ids[user_agent_hash_] = _ids[user_agent_hash_]
+                _ids.move_to_end(user_agent_hash_)
+
+    missing = {h: text for text, h in hashes.items() if h not in ids}
+    if missing:
+        found = dict(
+            UserAgent.objects.filter(hash__in=missing)
+            .values_list('hash', 'id')
+        )
+        new = [
+            UserAgent(hash=h, text=text, is_bot=is_bot_user_agent(text))
+            for h, text in missing.items() if h not in found
+        ]
+        if new:
+            # Another flush may insert the same user agent concurrently.
+            UserAgent.objects.bulk_create(new, ignore_conflicts=True)
+            found.update(
+                UserAgent.objects.filter(hash__in=[ua.hash for ua in new])
+                .values_list('hash', 'id')
+            )
+        _remember(found)
+        ids.update(found)
+
+    return {text: ids[h] for text, h in hashes.items()}
@@ -1,23 +1,96 @@
-from django.shortcuts import get_object_or_404, redirect
-from django.http import HttpRequest
-from . import models
+import logging
+
+import redis
+from django.conf import settings
+from django.contrib.auth.decorators import permission_required
+from django.shortcuts import redirect
+from django.http import (
+    Http404, HttpRequest, HttpResponseBadRequest, StreamingHttpResponse)
+from django.utils import timezone
+
+from ..utils.click_buffer import buffer_click
+from ..utils.click_export import (
+    EXPORT_FORMATS, iter_clicks, parse_export_time, render_clicks)
+from ..utils.click_tokens import BadClickToken, read_click_token
+from ..utils.redirect_cache import get_affiliate_link
+from ..utils.user_agents import is_bot_user_agent
+
+logger = logging.getLogger(__name__)
+
+# Request headers browsers send when fetching a page speculatively rather
+# than because someone followed the link.
+PREFETCH_HEADERS = {
+    'HTTP_PURPOSE': ('prefetch', 'preview'),
+    'HTTP_SEC_PURPOSE': ('prefetch', 'prerender'),
+    'HTTP_X_MOZ': ('prefetch',),
+    'HTTP_X_PURPOSE': ('prefetch', 'preview'),
+}
 
 
 def track_affiliate_click(request: HttpRequest):
-    affiliate_id = request.GET.get('affiliate_id')
+    try:
+        affiliate_id = int(request.GET.get('affiliate_id'))
+    except (TypeError, ValueError):
+        raise Http404("Invalid affiliate")
     product = request.GET.get('product')
 
-    affiliate = get_object_or_404(models.Affiliate, id=affiliate_id)
+    affiliate_link = get_affiliate_link(affiliate_id)
+    if affiliate_link is None:
+        raise Http404("No affiliate link found")
 
-    models.AffiliateClick.objects.create(
-        affiliate=affiliate,
-        affiliate_product=product or "Unknown",
-        ip_address=get_client_ip(request),
-        user_agent=request.META.get('HTTP_USER_AGENT', ''),
-    )
+    # Bots and prefetches still get the redirect but are not recorded.
+    # The click is written to the database later, in bulk, by the
+    # flush_affiliate_clicks task.
+    if not is_automated_request(request):
+        record_click(request, {
+            'affiliate_id': affiliate_id,
+            'affiliate_product': product or "Unknown",
+        })
 
     # Redirect to the actual affiliate link
-    return redirect(affiliate.affiliate_link)
+    return redirect(affiliate_link)
+
+
+def track_signed_click(request: HttpRequest, token: str):
+    """
+    Click on a link emitted by the affiliate linker. The affiliate, post
+    and keyword all come from the signed token, so the only lookup is the
+    cached redirect target.
+    """
+    try:
+        affiliate_id, post_id, keyword_id = read_click_token(token)
+    except BadClickToken:
+        raise Http404("Invalid affiliate link")
+
+    affiliate_link = get_affiliate_link(affiliate_id)
+    if affiliate_link is None:
+        raise Http404("No affiliate link found")
+
+    if not is_automated_request(request):
+        record_click(request, {
+            'affiliate_id': affiliate_id,
+            'post_id': post_id,
+            'keyword_id': keyword_id,
+        })
+
+    return redirect(affiliate_link)
+
+
+def record_click(request: HttpRequest, click):
+    """
+    Buffer a click for the flush task. The visitor is redirected whatever
+    happens here, so a Redis outage loses clicks, not revenue.
+    """
+    try:
+        buffer_click({
+            **click,
+            'ip_address': get_client_ip(request),
+            'user_agent': request.META.get('HTTP_USER_AGENT', ''),
+            'click_time': timezone.now().isoformat(),
+        })
+    except redis.RedisError:
+        logger.exception("Failed to buffer click for affiliate %s",
+                         click['affiliate_id'])
 
 
 def get_client_ip(request: HttpRequest):
@@ -27,3 +100,45 @@ def get_client_ip(request: HttpRequest):
     else:
         ip = request.META.get('REMOTE_ADDR')
     return ip
+
+
+def is_automated_request(request: HttpRequest):
+    """
+    Whether the click came from a crawler, link previewer or browser
+    prefetch rather than a person.
+    """
+    for header, purposes in PREFETCH_HEADERS.items():
+        value = request.META.get(header, '').lower()
+        if value and any(purpose in value for purpose in purposes):
+            return True
+    return is_bot_user_agent(request.META.get('HTTP_USER_AGENT', ''))
+
+
+@permission_required('autoblog.view_affiliateclick', raise_exception=True)
+def export_affiliate_clicks(request: HttpRequest):
+    """
+    Stream clicks between ``start`` (inclusive) and ``end`` (exclusive) as
+    CSV or NDJSON. Rows are read in keyset-paginated batches and written
+    as they are read, so memory use does not grow with the range.
+    """
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return HttpResponseBadRequest("format must be csv or ndjson")
+    try:
+        start = parse_export_time(request.GET.get('start'))
+        end = parse_export_time(request.GET.get('end'))
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+
+    rows = iter_clicks(
+        start=start,
+        end=end,
+        batch_size=settings.AFFILIATE_CLICK_EXPORT_BATCH_SIZE,
+    )
+    response = StreamingHttpResponse(
+        render_clicks(rows, export_format),
+        content_type=EXPORT_FORMATS[export_format],
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="affiliate-clicks.{export_format}"')
+    return response
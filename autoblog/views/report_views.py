@@ -0,0 +1,71 @@
+import django_filters
+from django.db.models import F
+
+from wagtail.admin.filters import DateRangePickerWidget, WagtailFilterSet
+from wagtail.admin.views.reports import ReportView
+
+from ..models.affiliate_models import (
+    Affiliate,
+    AffiliateClickDaily,
+    AffiliateClickHourly,
+)
+
+REPORT_FIELDS = ["bucket", "affiliate", "affiliate_product", "post",
+                 "clicks", "revenue"]
+
+
+def click_rollup_filterset(rollup_model, time_field):
+    class ClickRollupFilterSet(WagtailFilterSet):
+        period = django_filters.DateFromToRangeFilter(
+            field_name=time_field,
+            label="Period",
+            widget=DateRangePickerWidget,
+        )
+        affiliate = django_filters.ModelChoiceFilter(
+            queryset=Affiliate.objects.order_by('name'))
+
+        class Meta:
+            model = rollup_model
+            fields = ["period", "affiliate"]
+
+    return ClickRollupFilterSet
+
+
+class AffiliateClickReportView(ReportView):
+    """
+    Read-only listing of one of the click rollup tables, newest bucket
+    first, exportable as CSV or XLSX.
+    """
+    results_template_name = "autoblog/reports/affiliate_clicks_results.html"
+    model = None
+    time_field = None
+    list_export = REPORT_FIELDS
+    export_headings = {"bucket": "Period", "affiliate_product": "Product"}
+
+    def get_queryset(self):
+        return (
+            self.model.objects
+            .select_related('affiliate', 'post')
+            .annotate(bucket=F(self.time_field))
+            .order_by(f'-{self.time_field}', '-clicks')
+        )
+
+
+class AffiliateClickDailyReportView(AffiliateClickReportView):
+    model = AffiliateClickDaily
+    time_field = 'day'
+    page_title = "Daily affiliate clicks"
+    header_icon = "date"
+    index_url_name = "affiliate_clicks_daily_report"
+    index_results_url_name = "affiliate_clicks_daily_report_results"
+    filterset_class = click_rollup_filterset(AffiliateClickDaily, 'day')
+
+
+class AffiliateClickHourlyReportView(AffiliateClickReportView):
+    model = AffiliateClickHourly
+    time_field = 'hour'
+    page_title = "Hourly affiliate clicks"
+    header_icon = "time"
+    index_url_name = "affiliate_clicks_hourly_report"
+    index_results_url_name = "affiliate_clicks_hourly_report_results"
+    filterset_class = click_rollup_filterset(AffiliateClickHourly, 'hour')
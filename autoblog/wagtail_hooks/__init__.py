@@ -0,0 +1 @@
+from . import affiliate_hooks, generation_hooks  # noqa: F401
@@ -1,6 +1,11 @@
 
-from ...affiliate import models
+from django.urls import path, reverse
+
+from ..models import affiliate_models as models
+from ..views import report_views
+from wagtail import hooks
 from wagtail.admin import panels
+from wagtail.admin.menu import MenuItem
 from wagtail.snippets.views import snippets
 
 
@@ -20,3 +25,49 @@ class AffiliateSnippet(snippets.SnippetViewSet):
         panels.InlinePanel("keywords", heading="Keywords", label="Keyword"),
         panels.InlinePanel("prompts", heading="Prompts", label="Prompt"),
     ]
+
+
+# Read-only click rollup reports, under Reports in the admin menu.
+REPORTS = (
+    ("daily", report_views.AffiliateClickDailyReportView),
+    ("hourly", report_views.AffiliateClickHourlyReportView),
+)
+
+
+@hooks.register("register_reports_menu_item")
+def register_affiliate_click_daily_report_menu_item():
+    return MenuItem(
+        "Daily affiliate clicks",
+        reverse("affiliate_clicks_daily_report"),
+        icon_name="date",
+        order=800,
+    )
+
+
+@hooks.register("register_reports_menu_item")
+def register_affiliate_click_hourly_report_menu_item():
+    return MenuItem(
+        "Hourly affiliate clicks",
+        reverse("affiliate_clicks_hourly_report"),
+        icon_name="time",
+        order=801,
+    )
+
+
+@hooks.register("register_admin_urls")
+def register_affiliate_click_report_urls():
+    return [
+        path(
+            f"reports/affiliate-clicks/{slug}/",
+            view.as_view(),
+            name=view.index_url_name,
+        )
+        for slug, view in REPORTS
+    ] + [
+        path(
+            f"reports/affiliate-clicks/{slug}/results/",
+            view.as_view(results_only=True),
+            name=view.index_results_url_name,
+        )
+        for slug, view in REPORTS
+    ]
@@ -1,4 +1,4 @@
-# blog/wagtail_hooks.py
+# autoblog/wagtail_hooks/generation_hooks.py
 
 from wagtail.admin.panels import FieldPanel
 from wagtail.snippets.models import register_snippet
@@ -12,7 +12,7 @@ from django_celery_beat.models import (
     PeriodicTask,
 )
 
-from . import models
+from ..models import generation_models as models
 
 
 class CrontabScheduleSnippet(SnippetViewSet):
@@ -97,8 +97,27 @@ class GenerationStateSnippet(SnippetViewSet):
     ]
 
 
+class GenerationRunSnippet(SnippetViewSet):
+    model = models.GenerationRun
+    list_display = (
+        "affiliate",
+        "keyword",
+        "stage",
+        "post",
+        "updated_at",
+    )
+    list_filter = ("stage",)
+    panels = [
+        FieldPanel("stage"),
+        FieldPanel("title"),
+        FieldPanel("intro"),
+        FieldPanel("body"),
+        FieldPanel("last_error"),
+    ]
+
+
 class SetupSnippetGroup(SnippetViewSetGroup):
-    items = (GenerationStateSnippet)
+    items = (GenerationStateSnippet, GenerationRunSnippet)
     menu_icon = "cogs"
     menu_label = "Setup"
     menu_name = "setup"